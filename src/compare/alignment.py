@@ -0,0 +1,94 @@
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from compare.keys import encode_keys, normalize_primary_key
+
+
+def split_duplicate_keys(
+    df: pd.DataFrame,
+    primary_key: Union[str, Sequence[str]],
+    codes: np.ndarray,
+) -> Tuple[np.ndarray, pd.DataFrame, int]:
+    """
+    Split a DataFrame's rows into those whose primary key is unique &
+    not NULL and the quarantined rest, using the encoded key `codes`.
+
+    Returns:
+      clean_positions, duplicate_counts, quarantined_rows
+
+    duplicate_counts has the key column(s) plus COUNT, most frequent key first.
+    quarantined_rows counts both duplicated and NULL-key rows.
+    """
+    pk_cols = normalize_primary_key(primary_key)
+
+    null_mask = codes < 0
+    dup_mask = pd.Series(codes).duplicated(keep=False).to_numpy() & ~null_mask
+    bad_mask = dup_mask | null_mask
+
+    if dup_mask.any():
+        dup_counts = (
+            df.loc[dup_mask, pk_cols]
+            .value_counts()
+            .reset_index(name="COUNT")
+        )
+    else:
+        dup_counts = pd.DataFrame(columns=pk_cols + ["COUNT"])
+
+    return np.flatnonzero(~bad_mask), dup_counts, int(bad_mask.sum())
+
+
+def align_rows(
+    sf: pd.DataFrame,
+    laweb: pd.DataFrame,
+    primary_key: Union[str, Sequence[str]],
+    key_codes: Optional[Dict[str, np.ndarray]] = None,
+    backend: str = "pandas",
+) -> Dict[str, Any]:
+    """
+    Align SF & LAWEB rows one-to-one on the (possibly composite) primary key.
+
+    Duplicate and NULL keys are quarantined up front, so the join can never
+    turn into a many-to-many (cartesian) product: the aligned frames are at
+    most as long as the smaller input. The join itself runs on the int64
+    codes from compare.keys.encode_keys; pass `key_codes` to reuse them.
+
+    Returns dict:
+      {
+        "sf": DataFrame,             # SF rows with a unique key present in LAWEB
+        "laweb": DataFrame,          # LAWEB rows, same order as "sf"
+        "sf_duplicates": DataFrame,  # [<pk cols>..., COUNT]
+        "laweb_duplicates": DataFrame,
+        "sf_quarantined": int,
+        "laweb_quarantined": int,
+        "key_codes": {"sf": ndarray, "laweb": ndarray},
+      }
+    Both aligned frames share a fresh RangeIndex, so row i of one side
+    corresponds to row i of the other.
+    """
+    pk_cols = normalize_primary_key(primary_key)
+    if key_codes is None:
+        key_codes = encode_keys(sf, laweb, pk_cols, backend=backend)
+    sf_codes = key_codes["sf"]
+    lw_codes = key_codes["laweb"]
+
+    sf_clean, sf_dups, sf_quarantined = split_duplicate_keys(sf, pk_cols, sf_codes)
+    lw_clean, lw_dups, lw_quarantined = split_duplicate_keys(laweb, pk_cols, lw_codes)
+
+    # Keys are unique on both sides now, so get_indexer is a plain hash lookup
+    lw_index = pd.Index(lw_codes[lw_clean])
+    positions = lw_index.get_indexer(sf_codes[sf_clean])
+    matched = positions >= 0
+
+    sf_aligned = sf.iloc[sf_clean[matched]].reset_index(drop=True)
+    lw_aligned = laweb.iloc[lw_clean[positions[matched]]].reset_index(drop=True)
+
+    return {
+        "sf": sf_aligned,
+        "laweb": lw_aligned,
+        "sf_duplicates": sf_dups,
+        "laweb_duplicates": lw_dups,
+        "sf_quarantined": sf_quarantined,
+        "laweb_quarantined": lw_quarantined,
+        "key_codes": key_codes,
+    }
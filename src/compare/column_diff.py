@@ -0,0 +1,303 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import os
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+from compare.kernels import get_kernels
+from compare.keys import normalize_primary_key
+
+
+class DiffCancelled(RuntimeError):
+    """compute_column_diffs was stopped through its `cancel` event."""
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise DiffCancelled("column diff cancelled")
+
+
+def mismatch_mask(sf_values: pd.Series, lw_values: pd.Series, backend: str = "pandas") -> np.ndarray:
+    """
+    Boolean mask of positions where two aligned columns differ.
+    NULL on both sides counts as equal (same semantics as compare_rows).
+    """
+    return get_kernels(backend).mismatch_mask(sf_values, lw_values)
+
+
+def _top_value_pairs(kernels, sf_values: Any, lw_values: Any, mask: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+    """
+    Most frequent (value_sf, value_laweb) pairs among the mismatching rows
+    (ties: first occurrence first). Pairs are counted on factorized codes;
+    only the top_k results are turned into display strings.
+    """
+    if top_k <= 0 or not mask.any():
+        return []
+    codes_sf, uniques_sf = pd.factorize(kernels.masked_values(sf_values, mask))
+    codes_lw, uniques_lw = pd.factorize(kernels.masked_values(lw_values, mask))
+
+    # One int64 code per pair; NULL (-1) shifted to 0
+    pair_codes = (codes_sf.astype(np.int64) + 1) * (len(uniques_lw) + 1) + (codes_lw + 1)
+    pair_ids, _ = pd.factorize(pair_codes)  # ids in order of first occurrence
+    counts = np.bincount(pair_ids)
+    first = np.empty(len(counts), dtype=np.int64)
+    first[pair_ids[::-1]] = np.arange(len(pair_ids) - 1, -1, -1)
+    top = np.argsort(-counts, kind="stable")[:top_k]
+
+    def display(uniques, code):
+        return "__NA__" if code < 0 else str(uniques[code])
+
+    return [
+        {
+            "value_sf": display(uniques_sf, codes_sf[first[i]]),
+            "value_laweb": display(uniques_lw, codes_lw[first[i]]),
+            "count": int(counts[i]),
+        }
+        for i in top
+    ]
+
+
+def _diff_columns(
+    pairs: Sequence[Tuple[str, Any, Any]],
+    max_samples: int,
+    top_k: int,
+    backend: str = "pandas",
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """
+    Diff a group of column pairs.
+    Returns per-column stats and the mismatch mask of every column that
+    has at least one mismatch.
+    """
+    kernels = get_kernels(backend)
+    stats = []
+    masks: Dict[str, np.ndarray] = {}
+    for col, a, b in pairs:
+        _check_cancel(cancel)
+        if isinstance(a, pd.Series):
+            a = a.reset_index(drop=True)
+            b = b.reset_index(drop=True)
+        mask = kernels.mismatch_mask(a, b)
+        mismatches = int(mask.sum())
+        if mismatches:
+            masks[col] = mask
+        stats.append(
+            {
+                "column": col,
+                "mismatches": mismatches,
+                "positions": np.flatnonzero(mask)[:max_samples],
+                "top_pairs": _top_value_pairs(kernels, a, b, mask, top_k),
+            }
+        )
+    return stats, masks
+
+
+def _diff_worker(path: str, columns: List[str], max_samples: int, top_k: int, backend: str = "pandas"):
+    """
+    Process-pool entry point: memory-map the Arrow IPC file and diff only
+    this worker's columns. Nothing but column names crosses the process
+    boundary on the way in; the way out is per-column stats and bit-packed
+    masks for the columns that have mismatches. The Arrow backend diffs
+    the memory-mapped columns directly, without converting to pandas.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        if backend == "arrow":
+            pairs = [
+                (col, table.column(f"{col}_SF"), table.column(f"{col}_LAWEB"))
+                for col in columns
+            ]
+        else:
+            pairs = [
+                (
+                    col,
+                    table.column(f"{col}_SF").to_pandas(),
+                    table.column(f"{col}_LAWEB").to_pandas(),
+                )
+                for col in columns
+            ]
+        stats, masks = _diff_columns(pairs, max_samples, top_k, backend)
+
+    return stats, {col: np.packbits(mask) for col, mask in masks.items()}
+
+
+def _write_arrow_columns(
+    path: str,
+    sf_al: pd.DataFrame,
+    lw_al: pd.DataFrame,
+    columns: List[str],
+) -> List[str]:
+    """
+    Write the aligned column pairs to an Arrow IPC file.
+    Returns the columns Arrow could not represent (e.g. mixed-type object
+    columns); those are diffed in the parent process instead.
+    """
+    import pyarrow as pa
+
+    names, arrays, rejected = [], [], []
+    for col in columns:
+        try:
+            a = pa.array(sf_al[col], from_pandas=True)
+            b = pa.array(lw_al[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            rejected.append(col)
+            continue
+        names += [f"{col}_SF", f"{col}_LAWEB"]
+        arrays += [a, b]
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return rejected
+
+
+def _cooccurrence(
+    masks: Dict[str, np.ndarray], columns: List[str], n_rows: int, chunk_rows: int = 1 << 16
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    For each pair of failing columns, the number of rows where both differ
+    (M.T @ M over the failing rows x failing columns matrix M; the diagonal
+    is each column's own mismatch count). Also returns the row-level OR.
+
+    M is never materialized: the product is accumulated over blocks of
+    chunk_rows rows, so memory stays at chunk_rows x failing columns. Block
+    counts are at most chunk_rows (< 2**24), hence exact in float32 BLAS.
+    """
+    failing = [c for c in columns if c in masks]
+    any_mask = np.zeros(n_rows, dtype=bool)
+    co = np.zeros((len(failing), len(failing)), dtype=np.int64)
+    if not failing:
+        return [], co, any_mask
+
+    for start in range(0, n_rows, chunk_rows):
+        block = np.column_stack([masks[c][start:start + chunk_rows] for c in failing])
+        block_any = block.any(axis=1)
+        any_mask[start:start + chunk_rows] = block_any
+        rows = block[block_any].astype(np.float32)
+        if len(rows):
+            co += (rows.T @ rows).astype(np.int64)
+    return failing, co, any_mask
+
+
+def _cancel_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop the queued shards and terminate the workers still diffing one."""
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in processes:
+        proc.terminate()
+
+
+def compute_column_diffs(
+    aligned: Dict[str, Any],
+    primary_key: Union[str, Sequence[str]],
+    common_cols: List[str],
+    max_samples: int = 100,
+    workers: int = 1,
+    top_k: int = 5,
+    backend: str = "pandas",
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """
+    Per-column mismatch matrix over the aligned frames (see align_rows),
+    computed in a single pass over every common column.
+
+    With workers > 1 the aligned columns are written once to a memory-mapped
+    Arrow IPC file and column groups are sharded across a process pool, so
+    the frames themselves are never pickled. Requires pyarrow; without it
+    this falls back to the serial path. `backend` selects the compute
+    kernels ("pandas" or "arrow", see compare.kernels); both give the same
+    result. Setting `cancel` stops the diff between columns (serial) or
+    shards (pool: queued shards are dropped and the workers terminated)
+    and raises DiffCancelled.
+
+    Returns dict:
+      {
+        "rows": int,                  # aligned rows compared
+        "row_mismatch_count": int,    # rows with >= 1 differing column
+        "columns": [                  # common_cols order
+            {column, mismatches, rate_pct, positions, top_pairs}, ...
+        ],
+        "cooccurrence": {
+            "columns": [...],         # columns with >= 1 mismatch
+            "matrix": ndarray,        # rows where both columns differ
+        },
+      }
+    `positions` holds the first max_samples mismatching row positions and
+    `top_pairs` the top_k most frequent (value_sf, value_laweb) pairs.
+    """
+    pk_cols = normalize_primary_key(primary_key)
+    sf_al = aligned["sf"]
+    lw_al = aligned["laweb"]
+    n_rows = len(sf_al)
+
+    columns = [
+        c for c in common_cols
+        if c not in pk_cols and c in sf_al.columns and c in lw_al.columns
+    ]
+
+    if workers > 1:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("⚠️  pyarrow not installed → running the column diff serially.")
+            workers = 1
+
+    if workers <= 1 or n_rows == 0 or len(columns) < 2:
+        stats, masks = _diff_columns(
+            [(c, sf_al[c], lw_al[c]) for c in columns], max_samples, top_k, backend, cancel
+        )
+    else:
+        stats, masks = [], {}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "aligned.arrow")
+            rejected = _write_arrow_columns(path, sf_al, lw_al, columns)
+            sharded = [c for c in columns if c not in rejected]
+            groups = [
+                list(g) for g in np.array_split(np.array(sharded, dtype=object), workers * 4) if len(g)
+            ]
+
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                pending = {
+                    pool.submit(_diff_worker, path, g, max_samples, top_k, backend) for g in groups
+                }
+                while pending:
+                    if cancel is not None and cancel.is_set():
+                        _cancel_pool(pool)
+                        raise DiffCancelled("column diff cancelled")
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        group_stats, packed = fut.result()
+                        stats += group_stats
+                        for col, bits in packed.items():
+                            masks[col] = np.unpackbits(bits, count=n_rows).astype(bool)
+            finally:
+                pool.shutdown(wait=True)
+
+        if rejected:
+            local_stats, local_masks = _diff_columns(
+                [(c, sf_al[c], lw_al[c]) for c in rejected], max_samples, top_k, backend, cancel
+            )
+            stats += local_stats
+            masks.update(local_masks)
+
+        order = {c: i for i, c in enumerate(columns)}
+        stats.sort(key=lambda s: order[s["column"]])
+
+    for s in stats:
+        s["rate_pct"] = 0.0 if n_rows == 0 else 100.0 * s["mismatches"] / n_rows
+
+    co_columns, co_matrix, any_mask = _cooccurrence(masks, columns, n_rows)
+
+    return {
+        "rows": n_rows,
+        "row_mismatch_count": int(any_mask.sum()),
+        "columns": stats,
+        "cooccurrence": {"columns": co_columns, "matrix": co_matrix},
+    }
@@ -1,184 +1,234 @@
 import os
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+# Compiled templates are cached as bytecode here, so later runs skip parsing
+TEMPLATE_CACHE_DIR = os.path.join("reports", "cache", "templates")
+
+_ENVIRONMENT = None
+
+
+def _environment():
+    """
+    The shared Jinja2 environment (created on first use: jinja2 is not
+    imported on the light CLI paths). Autoescaping is on for all templates.
+    """
+    global _ENVIRONMENT
+    if _ENVIRONMENT is None:
+        import jinja2
+
+        try:
+            os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+        except OSError:
+            bytecode_cache = None
+
+        _ENVIRONMENT = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+            autoescape=True,
+            bytecode_cache=bytecode_cache,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+    return _ENVIRONMENT
+
+
+def _render_to_file(template_name: str, filename: str, context) -> None:
+    """
+    Stream a template to filename chunk by chunk; the full document is
+    never held in memory.
+    """
+    template = _environment().get_template(template_name)
+    with open(filename, "w", encoding="utf-8") as f:
+        template.stream(context).dump(f)
+
+
+def frame_table(df, limit=None):
+    """
+    Table section for the templates from a DataFrame: the column names and
+    a lazy row iterator (at most `limit` rows). Returns None for an empty
+    or missing frame.
+    """
+    if df is None or df.empty:
+        return None
+    if limit is not None:
+        df = df.head(limit)
+    return {"columns": list(df.columns), "rows": df.itertuples(index=False, name=None)}
+
+
+def _mismatch_context(column_diffs, max_heatmap_cols=30):
+    """
+    Template context for the Column Mismatch Matrix section
+    (compare.column_diff.compute_column_diffs): columns by mismatch count,
+    and the co-occurrence heatmap of the worst max_heatmap_cols columns.
+    """
+    if column_diffs is None:
+        return None
+
+    heatmap = None
+    co = column_diffs["cooccurrence"]
+    if co["columns"]:
+        matrix = co["matrix"]
+        order = sorted(range(len(co["columns"])), key=lambda i: matrix[i][i], reverse=True)
+        order = order[:max_heatmap_cols]
+        heatmap = {
+            "columns": co["columns"],
+            "matrix": matrix,
+            "order": order,
+            "peak": max(int(matrix[i][i]) for i in order) or 1,
+        }
+
+    return {
+        "rows": column_diffs["rows"],
+        "row_mismatch_count": column_diffs["row_mismatch_count"],
+        "stats": sorted(column_diffs["columns"], key=lambda c: c["mismatches"], reverse=True),
+        "heatmap": heatmap,
+    }
+
 
 def create_html_report(
     table_name: str,
-    score: float,
-    passed: int,
-    failed: int,
-    skipped: int,
-    critical_failed: int,
-    rule_table_html: str,
-    missing_columns_html: str,
-    dtype_diff_html: str,
-    id_diff_html: str,
-    row_diff_html: str,
+    dq_summary,
+    missing_in_sf=(),
+    missing_in_laweb=(),
+    dtype_diff=None,
+    schema_diff=(),
+    ids_sf_only=(),
+    ids_laweb_only=(),
+    duplicates=(),
+    column_diffs=None,
+    row_diff=None,
+    not_computed=None,
     output_folder: str = "reports/html",
 ) -> str:
     """
-    Generate a HTML dashboard-style report.
+    Generate a HTML dashboard-style report, streamed from the report.html.j2
+    template straight to the output file.
+
+    - dq_summary: rules.engine.evaluate_rules result
+    - dtype_diff / row_diff: tables from frame_table (rows are iterated
+      lazily, so large diffs are never rendered into one string)
+    - schema_diff: compare.schema_inference.compare_schemas rows
+    - duplicates: [{label, count, quarantined, table}] per side
+    - column_diffs: compare.column_diff.compute_column_diffs result
+    - not_computed: reason the mismatch matrix / row sample were not run,
+      for both, or per section as {"column_diffs": ..., "row_diff": ...}
+
+    All values are HTML-escaped. Returns the report filename.
     """
 
     # Gauge segments: red (0-50), orange (50-70), green (70-100)
-    score = float(score)
-    score_fail_deg = max(0.0, min(score, 50.0)) * 3.6
-    score_warn_deg = max(0.0, min(score - 50.0, 20.0)) * 3.6
-    score_pass_deg = max(0.0, max(score - 70.0, 0.0)) * 3.6
-
-    template = """
-<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8" />
-<title>{{table_name}} – Data Quality Dashboard</title>
-
-<style>
-    body {
-        font-family: 'Segoe UI', Tahoma, Arial, sans-serif;
-        background: #121417;
-        color: #e8e8e8;
-        margin: 0;
-        padding: 0;
-    }
-    .header {
-        background: linear-gradient(135deg,#007bff,#003d99);
-        padding: 30px;
-        text-align:center;
-        font-size:30px;
-        font-weight:bold;
-        color:white;
-        box-shadow:0 3px 10px rgba(0,0,0,0.4);
-    }
-    .container { width:94%; margin:20px auto; }
-    .card {
-        background: rgba(255,255,255,0.07);
-        border-radius:14px;
-        padding:20px;
-        margin-bottom:25px;
-        box-shadow:0 4px 14px rgba(0,0,0,0.35);
-    }
-    .flex-row { display:flex; flex-wrap:wrap; gap:20px; }
-    .gauge {
-        width:260px;height:260px;border-radius:50%;
-        background: conic-gradient(
-            #ff3d3d {{score_fail_deg}}deg,
-            #ffcc00 {{score_warn_deg}}deg,
-            #00cc66 {{score_pass_deg}}deg
-        );
-        display:flex;align-items:center;justify-content:center;
+    score = float(dq_summary["score"])
+    gauge = {
+        "fail_deg": max(0.0, min(score, 50.0)) * 3.6,
+        "warn_deg": max(0.0, min(score - 50.0, 20.0)) * 3.6,
+        "pass_deg": max(0.0, max(score - 70.0, 0.0)) * 3.6,
     }
-    .gauge-center {
-        width:180px;height:180px;border-radius:50%;
-        background:#121417;
-        font-size:42px;font-weight:bold;color:#00ff9d;
-        display:flex;align-items:center;justify-content:center;
-        box-shadow:0 0 18px rgba(0,255,157,0.45);
-    }
-    .summary-box { flex:1;min-width:200px;text-align:center; }
-    .summary-value { font-size:34px;font-weight:bold; }
-    .pass{color:#00ff9d;} .fail{color:#ff5252;} .warn{color:#ffcc00;}
-
-    details {
-        background: rgba(255,255,255,0.06);
-        padding:14px;border-radius:12px;margin-bottom:20px;
-        box-shadow:0 2px 6px rgba(0,0,0,0.4);
-    }
-    summary {font-size:20px;font-weight:bold;cursor:pointer;}
-
-    table{width:100%;border-collapse:collapse;margin-top:10px;font-size:14px;}
-    th{background:#1f2937;padding:10px;}
-    td{padding:7px;border-bottom:1px solid #333;}
-    tr:nth-child(even){background:#1a1f25;}
-    tr:hover{background:#28333f;}
-
-    .rule-pass{color:#00ff9d;font-weight:bold;}
-    .rule-fail{color:#ff6666;font-weight:bold;}
-    .rule-skip{color:#ffcc00;font-weight:bold;}
-
-    .sf-cell{background:#661111;color:#ffbaba;padding:3px;border-radius:4px;}
-    .lw-cell{background:#0d4d22;color:#9effc2;padding:3px;border-radius:4px;}
-
-</style>
-</head>
-
-<body>
-<div class="header">{{table_name}} – Data Quality Dashboard </div>
-
-<div class="container">
-
-<div class="flex-row">
-
-    <div class="card" style="flex:0 0 280px">
-        <h2 style="text-align:center;margin-bottom:10px;">Overall Quality</h2>
-        <div class="gauge"><div class="gauge-center">{{score}}%</div></div>
-    </div>
-
-    <div class="card" style="flex:1;">
-        <h2>Summary Statistics</h2>
-        <div class="flex-row">
-            <div class="summary-box"><h3>Passed</h3>
-                <div class="summary-value pass">{{passed}}</div></div>
-            <div class="summary-box"><h3>Failed</h3>
-                <div class="summary-value fail">{{failed}}</div></div>
-            <div class="summary-box"><h3>Skipped</h3>
-                <div class="summary-value warn">{{skipped}}</div></div>
-            <div class="summary-box"><h3>Critical Failures</h3>
-                <div class="summary-value fail">{{critical_failed}}</div></div>
-        </div>
-    </div>
-</div>
-
-<details open><summary>Rule Breakdown</summary>
-{{rule_table}}
-</details>
-
-<details><summary>Missing / Extra Columns</summary>
-{{missing_columns}}
-</details>
-
-<details><summary>Datatype Differences</summary>
-{{dtype_diff}}
-</details>
-
-<details><summary>ID Mismatch Summary</summary>
-{{id_diff}}
-</details>
-
-<details><summary>Row-level Mismatches (first 100)</summary>
-{{row_diff}}
-</details>
-
-</div>
-</body>
-</html>
-"""
-
-    html = (
-        template.replace("{{table_name}}", str(table_name))
-        .replace("{{score}}", str(score))
-        .replace("{{passed}}", str(passed))
-        .replace("{{failed}}", str(failed))
-        .replace("{{skipped}}", str(skipped))
-        .replace("{{critical_failed}}", str(critical_failed))
-        .replace("{{score_fail_deg}}", str(score_fail_deg))
-        .replace("{{score_warn_deg}}", str(score_warn_deg))
-        .replace("{{score_pass_deg}}", str(score_pass_deg))
-        .replace("{{rule_table}}", rule_table_html)
-        .replace("{{missing_columns}}", missing_columns_html)
-        .replace("{{dtype_diff}}", dtype_diff_html)
-        .replace("{{id_diff}}", id_diff_html)
-        .replace("{{row_diff}}", row_diff_html)
-    )
+
+    if not isinstance(not_computed, dict):
+        not_computed = {"column_diffs": not_computed, "row_diff": not_computed}
 
     os.makedirs(output_folder, exist_ok=True)
     filename = os.path.join(output_folder, f"{table_name}_comparison_report.html")
 
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(html)
+    _render_to_file(
+        "report.html.j2",
+        filename,
+        {
+            "table_name": table_name,
+            "summary": dq_summary,
+            "gauge": gauge,
+            "missing_in_sf": list(missing_in_sf),
+            "missing_in_laweb": list(missing_in_laweb),
+            "dtype_diff": dtype_diff,
+            "schema_diff": schema_diff,
+            "ids_sf_only": ids_sf_only,
+            "ids_laweb_only": ids_laweb_only,
+            "duplicates": duplicates,
+            "mismatch": _mismatch_context(column_diffs),
+            "row_diff": row_diff,
+            "not_computed": not_computed,
+        },
+    )
 
     print(f"\n✅ HTML report generated: {filename}")
     return filename
 
 
+def _svg_line_chart(values, flagged=(), width=640, height=180, unit=""):
+    """
+    Minimal inline SVG line chart (as safe markup for the templates).
+    `flagged` holds indexes drawn in red.
+    """
+    from markupsafe import Markup, escape
+
+    unit = escape(unit)
+    points = [(i, v) for i, v in enumerate(values) if v is not None]
+    if not points:
+        return Markup("<p>No data.</p>")
+
+    pad = 30
+    lo = min(v for _, v in points)
+    hi = max(v for _, v in points)
+    span = (hi - lo) or 1.0
+    n = max(len(values) - 1, 1)
+
+    def xy(i, v):
+        x = pad + (width - 2 * pad) * i / n
+        y = height - pad - (height - 2 * pad) * (v - lo) / span
+        return x, y
+
+    coords = [xy(i, v) for i, v in points]
+    path = " ".join(f"{x:.1f},{y:.1f}" for x, y in coords)
+    dots = "".join(
+        f"<circle cx='{x:.1f}' cy='{y:.1f}' r='4' fill='{'#ff5252' if i in flagged else '#00ff9d'}'>"
+        f"<title>run {i + 1}: {v:.4g}{unit}</title></circle>"
+        for (i, v), (x, y) in zip(points, coords)
+    )
+    return Markup(
+        f"<svg width='{width}' height='{height}' style='background:#1a1f25;border-radius:8px'>"
+        f"<text x='4' y='14' fill='#aaa' font-size='11'>{hi:.4g}{unit}</text>"
+        f"<text x='4' y='{height - 4}' fill='#aaa' font-size='11'>{lo:.4g}{unit}</text>"
+        f"<polyline fill='none' stroke='#4da3ff' stroke-width='2' points='{path}'/>"
+        f"{dots}</svg>"
+    )
+
+
+def create_trends_report(runs, regressions, output_folder: str = "reports/html") -> str:
+    """
+    Generate a HTML report charting score and runtime per table over time,
+    with the runs whose runtime or memory regressed highlighted.
+    `runs` / `regressions` come from utils.run_history.
+    """
+    by_table = {}
+    for run in runs:
+        if not run.get("cache_hit"):
+            by_table.setdefault(run["table_name"], []).append(run)
+
+    flagged_ids = {r["run_id"] for r in regressions}
+
+    tables = []
+    for table_name, table_runs in sorted(by_table.items()):
+        flagged = {i for i, r in enumerate(table_runs) if r["id"] in flagged_ids}
+        tables.append(
+            {
+                "name": table_name,
+                "runs": table_runs,
+                "last": table_runs[-1],
+                "charts": {
+                    "score": _svg_line_chart([r["score"] for r in table_runs]),
+                    "runtime": _svg_line_chart([r["total_seconds"] for r in table_runs], flagged, unit="s"),
+                    "memory": _svg_line_chart([r["peak_rss_mb"] for r in table_runs], flagged, unit=" MB"),
+                },
+            }
+        )
+
+    os.makedirs(output_folder, exist_ok=True)
+    filename = os.path.join(output_folder, "trends_report.html")
+    _render_to_file("trends.html.j2", filename, {"tables": tables, "regressions": regressions})
+
+    print(f"\n✅ Trends report generated: {filename}")
+    return filename
+
+
 # Backward-compat alias if older code imports this name
 generate_html_report = create_html_report
@@ -1,19 +1,44 @@
-from typing import List, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
 import pandas as pd
 
+from compare.keys import encode_keys, key_labels, normalize_primary_key
 
-def compare_ids(sf: pd.DataFrame, laweb: pd.DataFrame, primary_key: str) -> Tuple[list, list]:
+
+def compare_ids(
+    sf: pd.DataFrame,
+    laweb: pd.DataFrame,
+    primary_key: Union[str, Sequence[str]],
+    key_codes: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[list, list]:
     """
     Compare IDs between SF & LAWEB.
+
+    The set operations run on the int64 key codes from
+    compare.keys.encode_keys (pass `key_codes` to reuse them), so composite
+    keys cost the same as a single integer ID. Composite IDs are returned
+    as tuples.
+
     Returns:
       ids_in_sf_only, ids_in_laweb_only
     """
-    pk = primary_key.strip().upper()
+    pk_cols = normalize_primary_key(primary_key)
+    if key_codes is None:
+        key_codes = encode_keys(sf, laweb, pk_cols)
+    sf_codes = key_codes["sf"]
+    lw_codes = key_codes["laweb"]
 
-    sf_ids = set(sf[pk].dropna().unique())
-    lw_ids = set(laweb[pk].dropna().unique())
+    sf_only_mask = (sf_codes >= 0) & ~np.isin(sf_codes, lw_codes)
+    lw_only_mask = (lw_codes >= 0) & ~np.isin(lw_codes, sf_codes)
 
-    ids_in_sf_only = sorted(list(sf_ids - lw_ids))
-    ids_in_laweb_only = sorted(list(lw_ids - sf_ids))
+    ids_in_sf_only = _unique_labels(sf, pk_cols, sf_codes, sf_only_mask)
+    ids_in_laweb_only = _unique_labels(laweb, pk_cols, lw_codes, lw_only_mask)
 
     return ids_in_sf_only, ids_in_laweb_only
+
+
+def _unique_labels(df: pd.DataFrame, pk_cols, codes: np.ndarray, mask: np.ndarray) -> list:
+    """Sorted distinct key values of the rows selected by mask."""
+    _, first_pos = np.unique(codes[mask], return_index=True)
+    rows = np.flatnonzero(mask)[first_pos]
+    return sorted(key_labels(df.iloc[rows], pk_cols))
@@ -0,0 +1,193 @@
+from typing import Any, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Pluggable compute kernels behind the comparison functions.
+#
+# Every backend implements the same small set of column operations, with the
+# semantics of the original pandas code: two values match when they are
+# equal, or both NULL; values of unrelated types (e.g. "1" vs 1) never match.
+# Kernels accept pandas Series; the Arrow backend also accepts Arrow arrays
+# so the multiprocess diff can hand it memory-mapped columns as they are.
+
+BACKENDS = ("pandas", "arrow")
+
+
+class PandasKernels:
+    """Reference implementation on pandas / numpy."""
+
+    name = "pandas"
+
+    def mismatch_mask(self, a: Any, b: Any) -> np.ndarray:
+        a = _as_series(a).reset_index(drop=True)
+        b = _as_series(b).reset_index(drop=True)
+        both_null = a.isna().to_numpy(dtype=bool) & b.isna().to_numpy(dtype=bool)
+        # Nullable dtypes compare to NA against a NULL: one-sided NULLs differ
+        differ = (a != b).fillna(True).to_numpy(dtype=bool)
+        return differ & ~both_null
+
+    def null_mask(self, values: Any) -> np.ndarray:
+        return _as_series(values).isna().to_numpy(dtype=bool)
+
+    def factorize_pair(self, a: Any, b: Any) -> Tuple[np.ndarray, np.ndarray, int]:
+        a = _as_series(a)
+        b = _as_series(b)
+        codes, uniques = pd.factorize(pd.concat([a, b], ignore_index=True))
+        codes = codes.astype(np.int64)
+        return codes[: len(a)], codes[len(a):], len(uniques)
+
+    def masked_values(self, values: Any, mask: np.ndarray) -> pd.Series:
+        return _as_series(values).reset_index(drop=True)[mask].reset_index(drop=True)
+
+
+class ArrowKernels:
+    """
+    PyArrow-compute implementation; NULL handling is native (no sentinel).
+    Columns Arrow cannot represent (mixed-type object columns) fall back to
+    the pandas kernels.
+    """
+
+    name = "arrow"
+
+    def __init__(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        self.pa = pa
+        self.pc = pc
+        self._fallback = PandasKernels()
+
+    def to_arrow(self, values: Any):
+        pa = self.pa
+        if isinstance(values, pa.ChunkedArray):
+            return values.combine_chunks()
+        if isinstance(values, pa.Array):
+            return values
+        return pa.array(values, from_pandas=True)
+
+    def _family(self, arr) -> str:
+        t = arr.type
+        types = self.pa.types
+        if types.is_integer(t) or types.is_floating(t) or types.is_boolean(t):
+            return "numeric"
+        if types.is_string(t) or types.is_large_string(t):
+            return "string"
+        if types.is_null(t):
+            return "null"
+        return str(t)
+
+    def _unify(self, a, b):
+        """
+        Cast two arrays to a common type, or return None when their
+        values can never be equal (unrelated types).
+        """
+        if a.type == b.type:
+            return a, b
+        fa, fb = self._family(a), self._family(b)
+        if "null" in (fa, fb):
+            other = b if fa == "null" else a
+            return a.cast(other.type), b.cast(other.type)
+        if fa == fb == "numeric":
+            return a.cast(self.pa.float64()), b.cast(self.pa.float64())
+        if fa == fb == "string":
+            return a.cast(self.pa.large_string()), b.cast(self.pa.large_string())
+        if fa == fb:
+            try:
+                return a, b.cast(a.type)
+            except (self.pa.ArrowInvalid, self.pa.ArrowNotImplementedError):
+                return None
+        return None
+
+    def _to_arrow_pair(self, a: Any, b: Any):
+        """Both columns as Arrow arrays, or None if either cannot be."""
+        try:
+            return self.to_arrow(a), self.to_arrow(b)
+        except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+            return None
+
+    def mismatch_mask(self, a: Any, b: Any) -> np.ndarray:
+        arrays = self._to_arrow_pair(a, b)
+        if arrays is None:
+            return self._fallback.mismatch_mask(a, b)
+        a, b = arrays
+        pc = self.pc
+        both_null = pc.and_(pc.is_null(a, nan_is_null=True), pc.is_null(b, nan_is_null=True))
+
+        unified = self._unify(a, b)
+        if unified is None:
+            equal = both_null
+        else:
+            equal = pc.or_(pc.fill_null(pc.equal(*unified), False), both_null)
+
+        return np.asarray(pc.invert(equal).to_numpy(zero_copy_only=False), dtype=bool)
+
+    def null_mask(self, values: Any) -> np.ndarray:
+        try:
+            arr = self.to_arrow(values)
+        except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+            return self._fallback.null_mask(values)
+        return np.asarray(self.pc.is_null(arr, nan_is_null=True).to_numpy(zero_copy_only=False), dtype=bool)
+
+    def factorize_pair(self, a: Any, b: Any) -> Tuple[np.ndarray, np.ndarray, int]:
+        arrays = self._to_arrow_pair(a, b)
+        if arrays is None:
+            return self._fallback.factorize_pair(a, b)
+        a, b = arrays
+        unified = self._unify(a, b)
+        if unified is None:
+            # Unrelated types never match: encode each side on its own and
+            # shift the second side's codes past the first's
+            codes_a, n_a = self._factorize(a)
+            codes_b, n_b = self._factorize(b)
+            codes_b[codes_b >= 0] += n_a
+            return codes_a, codes_b, n_a + n_b
+
+        codes, n = self._factorize(self.pa.concat_arrays(list(unified)))
+        return codes[: len(a)], codes[len(a):], n
+
+    def _factorize(self, arr) -> Tuple[np.ndarray, int]:
+        pc = self.pc
+        if self.pa.types.is_floating(arr.type):
+            # NaN is NULL, as in pandas
+            arr = pc.if_else(pc.is_nan(arr), self.pa.scalar(None, arr.type), arr)
+        encoded = pc.dictionary_encode(arr)
+        codes = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False).astype(np.int64)
+        return codes, len(encoded.dictionary)
+
+    def masked_values(self, values: Any, mask: np.ndarray) -> pd.Series:
+        try:
+            arr = self.to_arrow(values)
+        except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+            return self._fallback.masked_values(values, mask)
+        return arr.filter(self.pa.array(mask)).to_pandas()
+
+
+def _as_series(values: Any) -> pd.Series:
+    if isinstance(values, pd.Series):
+        return values
+    if hasattr(values, "to_pandas"):  # Arrow array / chunked array
+        return values.to_pandas()
+    return pd.Series(values)
+
+
+_INSTANCES = {}
+
+
+def get_kernels(backend: str = "pandas"):
+    """
+    Kernel implementation for a backend name ("pandas" or "arrow").
+    The Arrow backend requires pyarrow.
+    """
+    backend = (backend or "pandas").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown compute backend '{backend}' (expected one of {', '.join(BACKENDS)}).")
+
+    if backend not in _INSTANCES:
+        if backend == "arrow":
+            try:
+                _INSTANCES[backend] = ArrowKernels()
+            except ImportError as exc:
+                raise ImportError("The 'arrow' compute backend requires pyarrow.") from exc
+        else:
+            _INSTANCES[backend] = PandasKernels()
+    return _INSTANCES[backend]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Union
+
+# numpy / pandas are only imported by encode_keys: normalize_primary_key is
+# also needed on the light CLI paths (cache hits, config validation)
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Packed keys stay strictly below this bound so they fit in an int64
+_MAX_PACKED_KEY = 2 ** 62
+
+
+def normalize_primary_key(primary_key: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Normalize a primary key spec into a list of UPPERCASE column names.
+
+    Accepts a single column ("ID"), a comma-separated string
+    ("INFOENTITA_ID, RUOLOREFERENTEENTITA_ID") or a YAML list.
+    """
+    if isinstance(primary_key, str):
+        parts = primary_key.split(",")
+    else:
+        parts = list(primary_key)
+
+    cols = [str(p).strip().upper() for p in parts if str(p).strip()]
+    if not cols:
+        raise ValueError("Primary key must name at least one column.")
+    return cols
+
+
+def encode_keys(
+    sf: pd.DataFrame,
+    laweb: pd.DataFrame,
+    primary_key: Union[str, Sequence[str]],
+    backend: str = "pandas",
+) -> Dict[str, np.ndarray]:
+    """
+    Encode the (possibly composite) primary key of both sides into a single
+    int64 code per row.
+
+    Each key column is factorized over SF + LAWEB together, so equal key
+    values get equal codes on both sides. The per-column codes are then
+    packed (mixed radix) into one int64; when the packed range would
+    overflow, the partial key is re-factorized to keep it dense.
+    `backend` selects the factorize kernel (see compare.kernels).
+
+    Returns dict:
+      {"sf": np.ndarray[int64], "laweb": np.ndarray[int64]}
+    Rows with a NULL in any key column get code -1.
+    """
+    import numpy as np
+    import pandas as pd
+    from compare.kernels import get_kernels
+
+    pk_cols = normalize_primary_key(primary_key)
+    kernels = get_kernels(backend)
+    n_sf = len(sf)
+
+    packed = np.zeros(n_sf + len(laweb), dtype=np.int64)
+    null_mask = np.zeros(len(packed), dtype=bool)
+    cardinality = 1
+
+    for col in pk_cols:
+        sf_codes, lw_codes, n_uniques = kernels.factorize_pair(sf[col], laweb[col])
+        codes = np.concatenate([sf_codes, lw_codes])
+        n_uniques = max(n_uniques, 1)
+
+        null_mask |= codes < 0
+
+        if cardinality * n_uniques >= _MAX_PACKED_KEY:
+            packed, dense_uniques = pd.factorize(packed)
+            cardinality = max(len(dense_uniques), 1)
+
+        packed = packed * n_uniques + np.maximum(codes, 0)
+        cardinality *= n_uniques
+
+    packed[null_mask] = -1
+    return {"sf": packed[:n_sf], "laweb": packed[n_sf:]}
+
+
+def key_labels(df: pd.DataFrame, primary_key: Union[str, Sequence[str]]) -> List[Any]:
+    """
+    Human-readable key values per row: the plain value for a single-column
+    key, a tuple for a composite key.
+    """
+    pk_cols = normalize_primary_key(primary_key)
+    if len(pk_cols) == 1:
+        return df[pk_cols[0]].tolist()
+    return list(df[pk_cols].itertuples(index=False, name=None))
@@ -1,65 +1,105 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
 import pandas as pd
 
+from compare.alignment import align_rows
+from compare.kernels import get_kernels
+from compare.keys import key_labels, normalize_primary_key
+
 
 def compare_rows(
     sf: pd.DataFrame,
     laweb: pd.DataFrame,
-    primary_key: str,
+    primary_key: Union[str, Sequence[str]],
     common_cols: List[str],
     max_mismatches: int = 100,
+    aligned: Optional[Dict[str, Any]] = None,
+    column_diffs: Optional[Dict[str, Any]] = None,
+    backend: str = "pandas",
 ) -> pd.DataFrame:
     """
     Row-level comparison between SF & LAWEB.
 
-    - Joins on primary_key (inner join).
+    - Aligns rows one-to-one on primary_key, which may be composite
+      (duplicate / NULL keys are quarantined, see compare.alignment.align_rows).
     - For each common column, checks where values differ.
     - Returns a "long" DataFrame with columns:
         PK, COLUMN, value_sf, value_laweb
+      (PK is a tuple for composite keys)
     - Limits to max_mismatches to keep HTML report readable.
+
+    Pass a pre-computed `aligned` result to avoid re-aligning the inputs,
+    and `column_diffs` (compare.column_diff.compute_column_diffs, e.g. from
+    the multiprocess path) to build the sample from its mismatch positions
+    instead of re-diffing the columns. `backend` selects the compute
+    kernels used to find differing values (see compare.kernels).
     """
-    pk = primary_key.strip().upper()
+    pk_cols = normalize_primary_key(primary_key)
 
-    merged = sf.merge(laweb, on=pk, how="inner", suffixes=("_SF", "_LAWEB"))
+    if aligned is None:
+        aligned = align_rows(sf, laweb, pk_cols)
+    sf_al = aligned["sf"]
+    lw_al = aligned["laweb"]
 
-    results = []
-    count = 0
+    if column_diffs is None:
+        # Same kernel equality as compute_column_diffs, stopping once
+        # max_mismatches positions have been found
+        kernels = get_kernels(backend)
+        stats = []
+        remaining = max_mismatches
+        for col in common_cols:
+            if remaining <= 0:
+                break
+            if col in pk_cols or col not in sf_al.columns or col not in lw_al.columns:
+                continue
+            positions = np.flatnonzero(kernels.mismatch_mask(sf_al[col], lw_al[col]))[:remaining]
+            stats.append({"column": col, "positions": positions})
+            remaining -= len(positions)
+        column_diffs = {"columns": stats}
 
-    for col in common_cols:
-        col_sf = f"{col}_SF"
-        col_lw = f"{col}_LAWEB"
+    return _rows_from_column_diffs(sf_al, lw_al, pk_cols, column_diffs, max_mismatches)
 
-        if col_sf not in merged.columns or col_lw not in merged.columns:
-            continue
 
-        sf_series = merged[col_sf].fillna("__NA__")
-        lw_series = merged[col_lw].fillna("__NA__")
+def _display_values(values: pd.Series) -> List[str]:
+    """Values as report strings; NULL is shown as "__NA__" (as in the top value pairs)."""
+    return ["__NA__" if pd.isna(v) else str(v) for v in values]
 
-        diff_mask = sf_series != lw_series
-        diff_indices = merged.index[diff_mask]
 
-        for idx in diff_indices:
-            if count >= max_mismatches:
-                break
+def _rows_from_column_diffs(
+    sf_al: pd.DataFrame,
+    lw_al: pd.DataFrame,
+    pk_cols: List[str],
+    column_diffs: Dict[str, Any],
+    max_mismatches: int,
+) -> pd.DataFrame:
+    """
+    Build the long-form sample from per-column mismatch positions
+    (compute_column_diffs, or the serial scan in compare_rows).
+    """
+    frames = []
+    remaining = max_mismatches
 
-            pk_val = merged.at[idx, pk]
-            val_sf = sf_series.at[idx]
-            val_lw = lw_series.at[idx]
+    for stat in column_diffs["columns"]:
+        if remaining <= 0:
+            break
+        positions = stat["positions"][:remaining]
+        if len(positions) == 0:
+            continue
 
-            results.append(
+        keys = sf_al[pk_cols].iloc[positions]
+        frames.append(
+            pd.DataFrame(
                 {
-                    "PK": pk_val,
-                    "COLUMN": col,
-                    "value_sf": str(val_sf),
-                    "value_laweb": str(val_lw),
+                    "PK": key_labels(keys, pk_cols),
+                    "COLUMN": stat["column"],
+                    "value_sf": _display_values(sf_al[stat["column"]].iloc[positions]),
+                    "value_laweb": _display_values(lw_al[stat["column"]].iloc[positions]),
                 }
             )
-            count += 1
-
-        if count >= max_mismatches:
-            break
+        )
+        remaining -= len(positions)
 
-    if not results:
+    if not frames:
         return pd.DataFrame(columns=["PK", "COLUMN", "value_sf", "value_laweb"])
 
-    return pd.DataFrame(results)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,246 @@
+import csv
+import io
+import os
+import random
+import re
+from typing import Any, Dict, List, Tuple
+
+# Sampling is pure stdlib: a --schema-only run never loads a full DataFrame.
+# The sampled values are classified with vectorized pandas string ops
+# (pandas is imported lazily, only when classifying).
+
+_BOOL_VALUES = {"true", "false", "t", "f", "yes", "no", "y", "n"}
+
+_INT_RE = re.compile(r"^[+-]?\d+$")
+_INT_SEP_RE = re.compile(r"^[+-]?\d{1,3}(,\d{3})+$")
+_DEC_RE = re.compile(r"^[+-]?\d*\.(\d+)$")
+_DEC_SEP_RE = re.compile(r"^[+-]?\d{1,3}(,\d{3})+\.(\d+)$")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?(\.(\d+))?$")
+_TIME_RE = re.compile(r"^\d{1,2}:\d{2}(:\d{2})?(\.(\d+))?$")
+
+# Columns with at most this many distinct values (and mostly repeats) are
+# reported as categorical rather than free text
+_CATEGORICAL_MAX_DISTINCT = 20
+_CATEGORICAL_MAX_RATIO = 0.5
+
+
+def _decode(raw: bytes) -> str:
+    """Same fallback as utils.file_loader: UTF-8 first, then latin1."""
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin1")
+
+
+def sample_csv_rows(
+    path: str,
+    head_rows: int = 2000,
+    n_chunks: int = 16,
+    chunk_bytes: int = 256 * 1024,
+    seed: int = 0,
+) -> Tuple[List[str], List[List[str]]]:
+    """
+    Read a bounded sample of a CSV file without loading it: the header,
+    the first head_rows rows, and n_chunks blocks read at random byte
+    offsets further into the file.
+
+    The first (partial) line of every random block and its trailing
+    partial line are dropped; rows that do not have as many fields as the
+    header (e.g. a block starting inside a quoted multi-line value) are
+    skipped. The sample is deterministic for a given seed.
+
+    Returns:
+      header, rows
+    """
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        head_lines = []
+        for _ in range(head_rows + 1):
+            line = f.readline()
+            if not line:
+                break
+            head_lines.append(line)
+        head_end = f.tell()
+
+        reader = csv.reader(io.StringIO(_decode(b"".join(head_lines))))
+        header = next(reader, [])
+        rows = [r for r in reader if len(r) == len(header)]
+
+        rng = random.Random(seed)
+        span = size - head_end - chunk_bytes
+        if span > 0:
+            for offset in sorted(rng.randrange(head_end, head_end + span) for _ in range(n_chunks)):
+                f.seek(offset)
+                block = f.read(chunk_bytes)
+                start = block.find(b"\n") + 1
+                end = block.rfind(b"\n") + 1
+                if start <= 0 or end <= start:
+                    continue
+                chunk_reader = csv.reader(io.StringIO(_decode(block[start:end])))
+                rows.extend(r for r in chunk_reader if len(r) == len(header))
+
+    return header, rows
+
+
+def infer_column_type(values: List[str]) -> Dict[str, Any]:
+    """
+    Infer the semantic type of one column from its sampled raw values.
+
+    Types: empty, boolean, integer, decimal, date, timestamp, time,
+    categorical, string. Numbers also carry their thousands `separator`
+    ("," / "" / None if unknown) and decimals their scale as `precision`;
+    timestamps / times carry their fractional-second `precision`.
+
+    Each value gets the first matching kind, in the order boolean, integer,
+    decimal, date, timestamp, time; every pattern is applied to the whole
+    column at once. A plain number of 4+ integer digits (which would have
+    shown a thousands separator) marks the separator as "".
+    """
+    import numpy as np
+    import pandas as pd
+
+    text = pd.Series(values, dtype="str").fillna("").str.strip()
+    non_null = text[text != ""]
+    info: Dict[str, Any] = {
+        "type": "empty",
+        "detail": "",
+        "separator": None,
+        "precision": 0,
+        "sampled": len(values),
+        "nulls": len(values) - len(non_null),
+    }
+    if non_null.empty:
+        return info
+
+    patterns = [
+        ("integer", _INT_RE, ""),
+        ("integer", _INT_SEP_RE, ","),
+        ("decimal", _DEC_RE, ""),
+        ("decimal", _DEC_SEP_RE, ","),
+        ("date", _DATE_RE, None),
+        ("timestamp", _TS_RE, None),
+        ("time", _TIME_RE, None),
+    ]
+    unclassified = ~non_null.str.lower().isin(_BOOL_VALUES).to_numpy()
+    kinds = set() if unclassified.all() else {"boolean"}
+    separators = set()
+    precision = 0
+    # Lengths from native string kernels (no per-value Python): the matched
+    # number / time patterns contain at most one "."
+    lengths = non_null.str.len().to_numpy()
+    dot = non_null.str.find(".").to_numpy()
+    signed = non_null.str.startswith(("+", "-")).to_numpy()
+    int_digits = np.where(dot >= 0, dot, lengths) - signed
+    fraction_digits = np.where(dot >= 0, lengths - dot - 1, 0)
+
+    for kind, regex, separator in patterns:
+        matched = unclassified & non_null.str.fullmatch(regex.pattern).to_numpy()
+        if not matched.any():
+            continue
+        unclassified &= ~matched
+        kinds.add(kind)
+        if separator == ",":
+            separators.add(",")
+        elif separator == "" and (int_digits[matched] >= 4).any():
+            separators.add("")
+        if kind in ("decimal", "timestamp", "time"):
+            precision = max(precision, int(fraction_digits[matched].max()))
+    if unclassified.any():
+        kinds.add("string")
+
+    if kinds == {"integer", "decimal"}:
+        kinds = {"decimal"}
+    if kinds == {"date", "timestamp"}:
+        kinds = {"timestamp"}
+
+    if len(kinds) == 1:
+        kind = kinds.pop()
+    else:
+        kind = "string"
+
+    if kind == "string":
+        distinct = non_null.nunique()
+        if distinct <= _CATEGORICAL_MAX_DISTINCT and distinct / len(non_null) <= _CATEGORICAL_MAX_RATIO:
+            kind = "categorical"
+            info["detail"] = f"{distinct} distinct"
+    elif kind in ("integer", "decimal"):
+        parts = []
+        if separators:
+            # "," wins if any value used it: mixed short / long values are normal
+            info["separator"] = max(separators)
+        if info["separator"]:
+            parts.append(f"thousands sep '{info['separator']}'")
+        if kind == "decimal":
+            info["precision"] = precision
+            parts.append(f"scale {precision}")
+        info["detail"] = ", ".join(parts)
+    elif kind in ("timestamp", "time"):
+        info["precision"] = precision
+        info["detail"] = f"precision {precision}"
+
+    info["type"] = kind
+    return info
+
+
+def infer_schema(path: str, **sample_kwargs) -> Dict[str, Dict[str, Any]]:
+    """
+    Infer the semantic type of every column of a CSV from a bounded sample
+    (see sample_csv_rows). Column names are normalized to UPPERCASE like
+    utils.file_loader.load_csv_case_insensitive.
+    """
+    header, rows = sample_csv_rows(path, **sample_kwargs)
+    schema = {}
+    for i, col in enumerate(header):
+        schema[col.strip().upper()] = infer_column_type([r[i] for r in rows])
+    return schema
+
+
+def compare_schemas(
+    sf_schema: Dict[str, Dict[str, Any]],
+    laweb_schema: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Semantic type disagreements for the columns present on both sides.
+    Columns that are entirely empty in either sample carry no type
+    information and are not reported.
+
+    Returns a list of rows:
+      COLUMN, SF_TYPE, LAWEB_TYPE, REASON
+    """
+    rows = []
+    for col in sorted(set(sf_schema) & set(laweb_schema)):
+        sf_t = sf_schema[col]
+        lw_t = laweb_schema[col]
+        if "empty" in (sf_t["type"], lw_t["type"]):
+            continue
+
+        if sf_t["type"] != lw_t["type"]:
+            reason = "Semantic type mismatch"
+        elif (
+            sf_t["separator"] is not None
+            and lw_t["separator"] is not None
+            and sf_t["separator"] != lw_t["separator"]
+        ):
+            reason = "Thousands separator mismatch"
+        elif sf_t["precision"] != lw_t["precision"]:
+            reason = "Precision / scale mismatch"
+        else:
+            continue
+
+        rows.append(
+            {
+                "COLUMN": col,
+                "SF_TYPE": _describe(sf_t),
+                "LAWEB_TYPE": _describe(lw_t),
+                "REASON": reason,
+            }
+        )
+    return rows
+
+
+def _describe(col_type: Dict[str, Any]) -> str:
+    if col_type["detail"]:
+        return f"{col_type['type']} ({col_type['detail']})"
+    return col_type["type"]
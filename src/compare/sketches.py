@@ -0,0 +1,593 @@
+import base64
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from compare.schema_inference import infer_column_type, infer_schema
+
+# Mergeable, constant-memory column summaries for distribution drift rules.
+#
+# Every sketch supports update (one chunk at a time), merge (sketches of two
+# partitions of the same data combine into the sketch of the whole) and a
+# JSON round trip, so a file is summarised once in a streaming pass and the
+# result persisted next to the other caches.
+
+SKETCH_DEFAULTS: Dict[str, int] = {
+    "hll_p": 14,            # 2**14 registers → ~0.8% standard error on distinct counts
+    "kll_k": 200,           # quantile sketch accuracy (rank error ~1.7 / k)
+    "cms_width": 1024,      # count-min counters per row
+    "cms_depth": 4,         # count-min rows
+    "heavy_candidates": 64, # tracked heavy-hitter candidates per column
+}
+
+DEFAULT_SKETCH_DIR = os.path.join("reports", "cache", "sketches")
+
+# Bumped when persisted sketches change meaning (e.g. how values are keyed)
+_SKETCH_FORMAT = 3
+
+# Semantic types (compare.schema_inference) that get a quantile sketch
+_QUANTILE_KINDS = {"integer": "numeric", "decimal": "numeric", "date": "datetime", "timestamp": "datetime"}
+
+# Fixed odd multipliers: independent count-min row hashes from one 64-bit hash
+_CMS_MULTIPLIERS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+     0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9],
+    dtype=np.uint64,
+)
+
+
+def _pack(arr: np.ndarray) -> str:
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(arr).tobytes())).decode("ascii")
+
+
+def _unpack(data: str, dtype, shape) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=dtype).reshape(shape).copy()
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """
+    Stable 64-bit hashes of the string form of values (same in every
+    process and run, unlike Python's hash()). Column values are turned into
+    canonical keys first (see _sketch_keys).
+    """
+    arr = np.asarray(values, dtype=object)
+    if len(arr) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    return pd.util.hash_array(arr.astype(str).astype(object), categorize=True)
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Bit length of uint64 values (exact: each 32-bit half fits a float64)."""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+
+class HyperLogLog:
+    """Distinct-count sketch; merge takes the register-wise maximum."""
+
+    def __init__(self, p: int = SKETCH_DEFAULTS["hll_p"]):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        shift = np.uint64(64 - self.p)
+        index = (hashes >> shift).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        rank = ((64 - self.p) - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog sketches with p={self.p} and p={other.p}.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * float(np.log(m / zeros))  # linear counting for small cardinalities
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": _pack(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        sketch.registers = _unpack(data["registers"], np.uint8, (1 << data["p"],))
+        return sketch
+
+
+class KLL:
+    """
+    Quantile sketch (KLL compactor hierarchy). Items at level h stand for
+    2**h input values; a full level is sorted and every other item is
+    promoted. Offsets alternate per compaction, so results are reproducible.
+    """
+
+    def __init__(self, k: int = SKETCH_DEFAULTS["kll_k"]):
+        self.k = k
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.levels: List[np.ndarray] = [np.zeros(0)]
+        self._compactions = 0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        lo, hi = float(values.min()), float(values.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.zeros(0))
+            items = np.sort(items)
+            keep = items[:1] if len(items) % 2 else items[:0]
+            pairs = items[len(keep):]
+            offset = self._compactions % 2
+            self._compactions += 1
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], pairs[offset::2]])
+            level = 0  # capacities shrink as the hierarchy grows: re-check from the bottom
+
+    def merge(self, other: "KLL") -> "KLL":
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compactions += other._compactions
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2.0 ** h) for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return float(items[order][min(position, len(items) - 1)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min,
+            "max": self.max,
+            "compactions": self._compactions,
+            "levels": [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLL":
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch._compactions = data["compactions"]
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in data["levels"]]
+        return sketch
+
+
+class CountMin:
+    """
+    Count-min frequency sketch plus a bounded set of heavy-hitter candidate
+    values (the most frequent by estimate, re-ranked after every update and
+    merge).
+    """
+
+    def __init__(
+        self,
+        width: int = SKETCH_DEFAULTS["cms_width"],
+        depth: int = SKETCH_DEFAULTS["cms_depth"],
+        candidates: int = SKETCH_DEFAULTS["heavy_candidates"],
+    ):
+        if width & (width - 1) or not 1 <= depth <= len(_CMS_MULTIPLIERS):
+            raise ValueError("Count-min width must be a power of two and depth at most 8.")
+        self.width = width
+        self.depth = depth
+        self.max_candidates = candidates
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.candidates: List[str] = []
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        shift = np.uint64(64 - int(np.log2(self.width)))
+        return np.stack([(hashes * _CMS_MULTIPLIERS[i]) >> shift for i in range(self.depth)]).astype(np.intp)
+
+    def update(self, values: Sequence[str], counts: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        counts = np.asarray(counts, dtype=np.int64)
+        cols = self._columns(hash_values(values))
+        for row in range(self.depth):
+            self.table[row] += np.bincount(cols[row], weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+        top = np.argsort(-counts, kind="stable")[: self.max_candidates]
+        self._rerank([values[i] for i in top])
+
+    def estimate(self, values: Sequence[str]) -> np.ndarray:
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        cols = self._columns(hash_values(values))
+        return np.min(self.table[np.arange(self.depth)[:, None], cols], axis=0)
+
+    def _rerank(self, new_values: List[str]) -> None:
+        pool = list(dict.fromkeys(self.candidates + [str(v) for v in new_values]))
+        estimates = self.estimate(pool)
+        order = np.argsort(-estimates, kind="stable")[: self.max_candidates]
+        self.candidates = [pool[i] for i in order]
+
+    def heavy_hitters(self, top_k: int) -> List[Dict[str, Any]]:
+        values = self.candidates[:top_k]
+        return [{"value": v, "count": int(c)} for v, c in zip(values, self.estimate(values))]
+
+    def merge(self, other: "CountMin") -> "CountMin":
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches of different shapes.")
+        self.table += other.table
+        self.total += other.total
+        self._rerank(other.candidates)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "max_candidates": self.max_candidates,
+            "total": self.total,
+            "table": _pack(self.table),
+            "candidates": self.candidates,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMin":
+        sketch = cls(data["width"], data["depth"], data["max_candidates"])
+        sketch.total = data["total"]
+        sketch.table = _unpack(data["table"], np.int64, (data["depth"], data["width"]))
+        sketch.candidates = list(data["candidates"])
+        return sketch
+
+
+# ---------------------------------------------------------------------------
+# Per-column / per-file sketches
+# ---------------------------------------------------------------------------
+
+
+def _new_column_sketch(kind: Optional[str], params: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "kind": kind,  # "numeric" / "datetime" (quantiles available) or None
+        "rows": 0,
+        "nulls": 0,
+        "hll": HyperLogLog(params["hll_p"]),
+        "kll": KLL(params["kll_k"]) if kind else None,
+        "cms": CountMin(params["cms_width"], params["cms_depth"], params["heavy_candidates"]),
+    }
+
+
+def _datetimes(values: pd.Series) -> np.ndarray:
+    """Datetime or ISO 8601 text values → datetime64[ns] (NaT if unparseable)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    else:
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+    return parsed.to_numpy(dtype="datetime64[ns]")
+
+
+def _quantile_values(values: pd.Series, kind: str, separator: Optional[str]) -> np.ndarray:
+    """Raw text values → float64 for the quantile sketch (NaN if unparseable)."""
+    if kind == "numeric":
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(np.float64).to_numpy()
+        text = values.astype(str)
+        if separator == ",":
+            text = text.str.replace(",", "", regex=False)
+        return pd.to_numeric(text, errors="coerce").astype(np.float64).to_numpy()
+
+    parsed = _datetimes(values)
+    ns = parsed.astype(np.int64).astype(np.float64)
+    ns[np.isnat(parsed)] = np.nan
+    return ns
+
+
+def _sketch_keys(values: pd.Series, kind: Optional[str], separator: Optional[str]) -> np.ndarray:
+    """
+    Canonical string keys for the distinct-count and frequency sketches, so
+    a value hashes the same however it was loaded: numbers by value
+    (integral floats as integers, 1.0 → "1"; "1,000" → "1000"), dates and
+    timestamps in ISO 8601, booleans as "true" / "false". Text, and values
+    that do not parse as the column's kind, keep their string form.
+    """
+    keys = values.astype(str).to_numpy(dtype=object)
+    if pd.api.types.is_bool_dtype(values) or values.dtype == object:
+        flags = values.map(lambda v: isinstance(v, (bool, np.bool_))).to_numpy(dtype=bool)
+        keys[flags] = np.char.lower(keys[flags].astype(str))
+    if kind is None or pd.api.types.is_bool_dtype(values) or pd.api.types.is_integer_dtype(values):
+        return keys
+
+    if kind == "numeric":
+        numbers = _quantile_values(values, kind, separator)
+        parsed = ~np.isnan(numbers)
+        integral = parsed & (np.abs(numbers) < 2.0 ** 53) & (numbers == np.floor(numbers))
+        keys[integral] = numbers[integral].astype(np.int64).astype(str)
+        fractional = parsed & ~integral
+        keys[fractional] = numbers[fractional].astype(str)
+    else:
+        stamps = _datetimes(values)
+        parsed = ~np.isnat(stamps)
+        keys[parsed] = np.datetime_as_string(stamps[parsed], unit="auto")
+    return keys
+
+
+def _update_column_sketch(sketch: Dict[str, Any], values: pd.Series, separator: Optional[str] = None) -> None:
+    null_mask = values.isna().to_numpy()
+    present = values[~null_mask]
+    sketch["rows"] += len(values)
+    sketch["nulls"] += int(null_mask.sum())
+    if present.empty:
+        return
+
+    # Keys are built once per distinct value; spellings of the same value merge
+    counts = present.value_counts(sort=False)
+    counts = pd.Series(
+        counts.to_numpy(), index=_sketch_keys(counts.index.to_series(), sketch["kind"], separator)
+    )
+    if counts.index.has_duplicates:
+        counts = counts.groupby(level=0, sort=False).sum()
+    sketch["hll"].update(hash_values(counts.index))
+    sketch["cms"].update(list(counts.index), counts.to_numpy())
+    if sketch["kll"] is not None:
+        sketch["kll"].update(_quantile_values(present, sketch["kind"], separator))
+
+
+def sketch_chunks(
+    chunks: Iterable[pd.DataFrame],
+    kinds: Optional[Dict[str, Optional[str]]] = None,
+    separators: Optional[Dict[str, Optional[str]]] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Build the sketches of every column in one pass over an iterable of
+    DataFrame chunks. Memory is bounded by the chunk size plus the sketches.
+
+    kinds maps a column to "numeric" / "datetime" (quantile sketch) or None;
+    columns missing from it get no quantile sketch. separators gives the
+    thousands separator of numeric text columns.
+
+    Returns dict:
+      {"rows": int, "params": {...}, "columns": {COLUMN: {kind, rows, nulls, hll, kll, cms}}}
+    """
+    params = {**SKETCH_DEFAULTS, **params}
+    kinds = kinds or {}
+    separators = separators or {}
+    result: Dict[str, Any] = {"rows": 0, "params": params, "columns": {}}
+
+    for chunk in chunks:
+        chunk.columns = [str(c).strip().upper() for c in chunk.columns]
+        result["rows"] += len(chunk)
+        for col in chunk.columns:
+            sketch = result["columns"].get(col)
+            if sketch is None:
+                sketch = result["columns"][col] = _new_column_sketch(kinds.get(col), params)
+            _update_column_sketch(sketch, chunk[col], separators.get(col))
+
+    return result
+
+
+def sketch_dataframe(
+    df: pd.DataFrame,
+    chunksize: int = 100_000,
+    sample_rows: int = 2000,
+    schema: Optional[Dict[str, Dict[str, Any]]] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Sketches of an in-memory DataFrame. Numeric and datetime dtypes get a
+    quantile sketch; text columns are typed by `schema` (an already inferred
+    compare.schema_inference.infer_schema result) when it has them,
+    otherwise from their first sample_rows values like sketch_csv does.
+    """
+    schema = schema or {}
+    kinds: Dict[str, Optional[str]] = {}
+    separators: Dict[str, Optional[str]] = {}
+    for col in df.columns:
+        name = str(col).strip().upper()
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values) or values.isna().all():
+            kinds[name] = None  # all-NULL columns load as float64 but carry no type
+        elif pd.api.types.is_numeric_dtype(values):
+            kinds[name] = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            kinds[name] = "datetime"
+        else:
+            info = schema.get(name) or infer_column_type(values.iloc[:sample_rows].fillna("").astype(str).tolist())
+            kinds[name] = _QUANTILE_KINDS.get(info["type"])
+            separators[name] = info["separator"]
+    chunks = (df.iloc[i:i + chunksize].copy() for i in range(0, max(len(df), 1), chunksize))
+    return sketch_chunks(chunks, kinds, separators, **params)
+
+
+def sketch_csv(
+    path: str,
+    chunksize: int = 100_000,
+    schema: Optional[Dict[str, Dict[str, Any]]] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Sketches of a CSV file in one streaming pass (pd.read_csv chunks, all
+    values read as text). Quantile sketches are kept for the columns whose
+    sampled semantic type (compare.schema_inference; pass `schema` to reuse
+    an inferred one) is numeric or a date / timestamp.
+    """
+    schema = schema or infer_schema(path)
+    kinds = {col: _QUANTILE_KINDS.get(t["type"]) for col, t in schema.items()}
+    separators = {col: t["separator"] for col, t in schema.items()}
+
+    try:
+        chunks = pd.read_csv(path, dtype=str, chunksize=chunksize, encoding="utf-8")
+        return sketch_chunks(chunks, kinds, separators, **params)
+    except UnicodeDecodeError:
+        # Same fallback as utils.file_loader; restart the pass from scratch
+        chunks = pd.read_csv(path, dtype=str, chunksize=chunksize, encoding="latin1")
+        return sketch_chunks(chunks, kinds, separators, **params)
+
+
+def merge_sketches(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine the sketches of two partitions of the same table (e.g. daily
+    extract files) into the sketches of their union. `a` is updated in place.
+    """
+    a["rows"] += b["rows"]
+    for col, other in b["columns"].items():
+        mine = a["columns"].get(col)
+        if mine is None:
+            a["columns"][col] = other
+            continue
+        mine["rows"] += other["rows"]
+        mine["nulls"] += other["nulls"]
+        mine["hll"].merge(other["hll"])
+        mine["cms"].merge(other["cms"])
+        if mine["kll"] is not None and other["kll"] is not None:
+            mine["kll"].merge(other["kll"])
+        elif mine["kll"] is None and other["kll"] is not None:
+            mine["kind"], mine["kll"] = other["kind"], other["kll"]
+    return a
+
+
+def sketches_to_dict(sketches: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rows": sketches["rows"],
+        "params": sketches["params"],
+        "columns": {
+            col: {
+                "kind": s["kind"],
+                "rows": s["rows"],
+                "nulls": s["nulls"],
+                "hll": s["hll"].to_dict(),
+                "kll": s["kll"].to_dict() if s["kll"] is not None else None,
+                "cms": s["cms"].to_dict(),
+            }
+            for col, s in sketches["columns"].items()
+        },
+    }
+
+
+def sketches_from_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rows": data["rows"],
+        "params": data["params"],
+        "columns": {
+            col: {
+                "kind": s["kind"],
+                "rows": s["rows"],
+                "nulls": s["nulls"],
+                "hll": HyperLogLog.from_dict(s["hll"]),
+                "kll": KLL.from_dict(s["kll"]) if s["kll"] is not None else None,
+                "cms": CountMin.from_dict(s["cms"]),
+            }
+            for col, s in data["columns"].items()
+        },
+    }
+
+
+def load_or_build_sketches(
+    path: str,
+    sketch_dir: str = DEFAULT_SKETCH_DIR,
+    schema: Optional[Dict[str, Dict[str, Any]]] = None,
+    frame: Optional[pd.DataFrame] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Sketches of a CSV file, persisted in sketch_dir keyed by the file's
+    content digest and the sketch parameters: an unchanged file is only
+    scanned once. When the file is already loaded, pass it as `frame` to
+    sketch it in memory instead of reading it again.
+    """
+    from utils.result_cache import _read_json, _write_json, file_digest
+
+    params = {**SKETCH_DEFAULTS, **params}
+    param_tag = "-".join(str(params[k]) for k in sorted(params))
+    cache_path = os.path.join(sketch_dir, f"{file_digest(path)}-v{_SKETCH_FORMAT}-{param_tag}.json")
+
+    cached = _read_json(cache_path)
+    if cached is not None:
+        try:
+            return sketches_from_dict(cached)
+        except (KeyError, TypeError, ValueError):
+            pass  # corrupt entry: rebuild
+
+    if frame is not None:
+        sketches = sketch_dataframe(frame, schema=schema, **params)
+    else:
+        sketches = sketch_csv(path, schema=schema, **params)
+    _write_json(cache_path, sketches_to_dict(sketches))
+    return sketches
+
+
+def sketch_files(
+    paths: Sequence[str],
+    sketch_dir: str = DEFAULT_SKETCH_DIR,
+    schema: Optional[Dict[str, Dict[str, Any]]] = None,
+    frame: Optional[pd.DataFrame] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Sketches of a table split across several files (partitions): each file
+    is sketched (or loaded from sketch_dir) on its own, then merged.
+
+    `frame` is the table already loaded by utils.file_loader; files whose
+    sketches are not persisted yet are then sketched from their slice of it
+    (attrs["partition_rows"]) rather than read again.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    parts: List[Optional[pd.DataFrame]] = [None] * len(paths)
+    if frame is not None:
+        rows = frame.attrs.get("partition_rows", [len(frame)])
+        if len(rows) == len(paths) and sum(rows) == len(frame):
+            bounds = np.cumsum([0] + list(rows))
+            parts = [frame.iloc[bounds[i]:bounds[i + 1]] for i in range(len(paths))]
+
+    merged = None
+    for path, part in zip(paths, parts):
+        sketches = load_or_build_sketches(path, sketch_dir, schema=schema, frame=part, **params)
+        merged = sketches if merged is None else merge_sketches(merged, sketches)
+    return merged
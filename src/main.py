@@ -1,88 +1,333 @@
 import argparse
 import os
-import pandas as pd
-
-from utils.config_loader import load_table_config
-from utils.file_loader import load_csv_case_insensitive
-from compare.column_comparison import compare_columns
-from compare.datatype_comparison import compare_dtypes
-from compare.id_comparison import compare_ids
-from compare.row_comparison import compare_rows
-from rules.engine import evaluate_rules
-from compare.generate_html import create_html_report
-
-
-def build_rule_table_html(rule_results):
-    if not rule_results:
-        return "<p>No rules evaluated.</p>"
-
-    rows = []
-    for r in rule_results:
-        status = r["result"]
-        cls = (
-            "rule-pass" if status == "PASS"
-            else "rule-fail" if status == "FAIL"
-            else "rule-skip"
-        )
-        rows.append(
-            f"<tr>"
-            f"<td>{r['id']}</td>"
-            f"<td>{r['name']}</td>"
-            f"<td>{r['priority']}</td>"
-            f"<td class='{cls}'>{status}</td>"
-            f"<td>{r.get('details','')}</td>"
-            f"</tr>"
-        )
+import sys
+from datetime import datetime
+
+# Only light modules at import time: --help, --validate-config and cache
+# hits never import pandas. The comparison modules are imported in
+# run_comparison once a full run is actually needed.
+from utils.config_loader import load_table_config, validate_table_config
+from compare.keys import normalize_primary_key
+from rules.engine import load_execution_policy, load_rules_config, validate_rules_config
+from compare.generate_html import create_html_report, create_trends_report, frame_table
+from utils.helpers import StageTimer, partition_paths, peak_rss_mb
+from version import __version__
+
+RULE_COSTS_PATH = os.path.join("reports", "cache", "rule_costs.json")
+
+
+def build_duplicate_keys_section(aligned, max_keys=200):
+    return [
+        {
+            "label": label,
+            "count": len(aligned[f"{side}_duplicates"]),
+            "quarantined": aligned[f"{side}_quarantined"],
+            "table": frame_table(aligned[f"{side}_duplicates"], limit=max_keys),
+        }
+        for label, side in (("SF", "sf"), ("LAWEB", "laweb"))
+    ]
+
 
-    return (
-        "<table>"
-        "<tr><th>Rule ID</th><th>Name</th><th>Priority</th><th>Status</th><th>Details</th></tr>"
-        + "".join(rows)
-        + "</table>"
+def print_scorecard(dq_summary):
+    print("\n📊 Data Quality Scorecard")
+    print("------------------------")
+    print(
+        f"Overall Score: {dq_summary['score']}%\n"
+        f"Passed: {dq_summary['passed']} | "
+        f"Failed: {dq_summary['failed']} | "
+        f"Skipped: {dq_summary['skipped']} | "
+        f"Timed Out: {dq_summary.get('timed_out', 0)} | "
+        f"Critical Failed: {dq_summary['critical_failed']}"
+    )
+    for r in dq_summary["rules"]:
+        print(f"- {r['id']} [{r['priority']}] -> {r['result']}: {r['name']}")
+    if dq_summary.get("stopped_early"):
+        print(f"⏹  Stopped early: {dq_summary['stopped_early']}")
+
+
+def build_cache_key(sf_path, laweb_path, table_name, pk, dtype_map_path, enabled_rules, policy):
+    """
+    Content-addressed key for a run: input file hashes, the effective rule
+    configuration (global rules filtered by the table's rules_enabled, plus
+    the execution policy), the tool version and a digest of the source tree.
+    """
+    from utils.result_cache import code_digest, compute_cache_key, file_digest
+
+    rules_cfg = load_rules_config()
+    if enabled_rules is not None:
+        rules_cfg = {rid: rdef for rid, rdef in rules_cfg.items() if rid in enabled_rules}
+
+    return compute_cache_key(
+        {
+            "version": __version__,
+            "code": code_digest(os.path.dirname(os.path.abspath(__file__))),
+            "table": table_name,
+            "sf": [file_digest(p) for p in partition_paths(sf_path)],
+            "laweb": [file_digest(p) for p in partition_paths(laweb_path)],
+            "dtype_map": file_digest(dtype_map_path),
+            "primary_key": pk,
+            "rules": rules_cfg,
+            "execution": policy,
+        }
     )
 
 
-def run_comparison(sf_path, laweb_path, table_name, primary_key, dtype_map_path=None, enabled_rules=None):
+def run_schema_check(sf_path, laweb_path):
+    """
+    Infer semantic column types from bounded samples of both CSVs (the
+    first file of a partitioned extract) and print the disagreements.
+    Never loads the full files.
+
+    Returns dict:
+      {"sf": schema, "laweb": schema, "diff": [...]}
+    with the inferred schemas (reused to type the sketch rules' columns)
+    and the compare_schemas rows.
+    """
+    from compare.schema_inference import compare_schemas, infer_schema
+
+    sf_schema = infer_schema(partition_paths(sf_path)[0])
+    laweb_schema = infer_schema(partition_paths(laweb_path)[0])
+    schema_diff = compare_schemas(sf_schema, laweb_schema)
+
+    print(f"\n🔎 Sampled schema check: {len(schema_diff)} semantic type differences")
+    for d in schema_diff:
+        print(f"- {d['COLUMN']}: SF={d['SF_TYPE']} | LAWEB={d['LAWEB_TYPE']} ({d['REASON']})")
+    return {"sf": sf_schema, "laweb": laweb_schema, "diff": schema_diff}
+
+
+def _total_bytes(path):
+    """Size of an extract (summed over its partition files), None if missing."""
+    paths = partition_paths(path)
+    if not paths or not all(os.path.exists(p) for p in paths):
+        return None
+    return sum(os.path.getsize(p) for p in paths)
+
+
+def record_history(
+    table_name,
+    sf_path,
+    laweb_path,
+    dq_summary,
+    timer,
+    cache_hit=False,
+    sf_rows=None,
+    laweb_rows=None,
+    column_diffs=None,
+    workers=1,
+    backend="pandas",
+):
+    """
+    Append this run to the SQLite run history and warn when its runtime
+    or memory regressed against the moving baseline of comparable runs
+    (same input content, workers and backend).
+    """
+    from utils.result_cache import compute_cache_key, file_digest
+    from utils.run_history import find_regressions, load_history_settings, load_runs, record_run
+
+    settings = load_history_settings()
+    if not settings["enabled"]:
+        return
+
+    run = {
+        "table_name": table_name,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "tool_version": __version__,
+        "cache_hit": int(cache_hit),
+        "sf_rows": sf_rows,
+        "laweb_rows": laweb_rows,
+        "sf_bytes": _total_bytes(sf_path),
+        "laweb_bytes": _total_bytes(laweb_path),
+        "row_mismatch_count": column_diffs["row_mismatch_count"] if column_diffs else None,
+        "total_seconds": timer.total,
+        "peak_rss_mb": peak_rss_mb(),
+        "input_digest": compute_cache_key(
+            {
+                "sf": [file_digest(p) for p in partition_paths(sf_path)],
+                "laweb": [file_digest(p) for p in partition_paths(laweb_path)],
+            }
+        ),
+        "workers": workers,
+        "backend": backend,
+    }
+    for key in ("score", "passed", "failed", "skipped", "timed_out", "critical_failed"):
+        run[key] = dq_summary.get(key)
+
+    run_id = record_run(
+        settings["path"],
+        run,
+        dq_summary["rules"],
+        stage_timings=timer.timings,
+        column_stats=column_diffs["columns"] if column_diffs else None,
+    )
+
+    if cache_hit:
+        return
+    regressions = find_regressions(
+        load_runs(settings["path"], table_name),
+        threshold_pct=settings["regression_threshold_pct"],
+        window=settings["baseline_window"],
+    )
+    for r in regressions:
+        if r["run_id"] == run_id:
+            print(
+                f"⚠️  {r['metric']} regressed: {r['value']:.3f} vs baseline "
+                f"{r['baseline']:.3f} (+{r['increase_pct']:.1f}%)"
+            )
+
+
+def run_trends_report():
+    from utils.run_history import find_regressions, load_history_settings, load_runs
+
+    settings = load_history_settings()
+    runs = load_runs(settings["path"])
+    regressions = find_regressions(
+        runs,
+        threshold_pct=settings["regression_threshold_pct"],
+        window=settings["baseline_window"],
+    )
+    print(f"\n📈 {len(runs)} runs recorded, {len(regressions)} regressions flagged.")
+    return create_trends_report(runs, regressions)
+
+
+def run_config_validation(rules_path="config/data_quality_rules.yaml"):
+    """
+    Validate table_mapping.yaml and the rules YAML (rule types, execution
+    policies, referenced files) without loading any data.
+    Returns True when no problems were found.
+    """
+    problems = validate_rules_config(rules_path)
+    try:
+        tables = load_table_config()
+    except (OSError, ValueError) as exc:
+        problems.append(str(exc))
+        tables = {}
+
+    try:
+        rule_ids = load_rules_config(rules_path)
+    except (OSError, ValueError):
+        rule_ids = {}
+    problems += validate_table_config(tables, rule_ids)
+
+    for table, entry in tables.items():
+        if isinstance(entry, dict) and entry.get("execution") is not None:
+            try:
+                load_execution_policy(rules_path, overrides=entry["execution"])
+            except (ValueError, TypeError, AttributeError) as exc:
+                problems.append(f"Table {table}: invalid execution block: {exc}")
+
+    if problems:
+        print(f"❌ Configuration invalid ({len(problems)} problems):")
+        for p in problems:
+            print(f"- {p}")
+        return False
+
+    print(f"✅ Configuration valid: {len(tables)} tables, {len(rule_ids)} rules.")
+    return True
+
+
+def run_comparison(
+    sf_path,
+    laweb_path,
+    table_name,
+    primary_key,
+    dtype_map_path=None,
+    enabled_rules=None,
+    workers=1,
+    force=False,
+    schema_only=False,
+    execution=None,
+    backend="pandas",
+):
     print(f"\n🚀 Running Comparison for: {table_name}")
     print("----------------------------------------")
     print(f"SF CSV Path:        {sf_path}")
     print(f"LAWEB CSV Path:     {laweb_path}")
-    print(f"Primary Key (norm): {primary_key}")
+    pk = normalize_primary_key(primary_key)
+    print(f"Primary Key (norm): {' + '.join(pk)}")
     print(f"DType Mapping File: {dtype_map_path if dtype_map_path else '(none → using inferred dtypes)'}")
 
+    if schema_only:
+        return run_schema_check(sf_path, laweb_path)
+
+    from utils.result_cache import load_cached_result, store_result
+
+    timer = StageTimer()
+
+    # Result cache: skip the whole comparison if nothing relevant changed
+    policy = load_execution_policy(overrides=execution)
+    cache_key = build_cache_key(sf_path, laweb_path, table_name, pk, dtype_map_path, enabled_rules, policy)
+    if force:
+        print("\n♻️  Cache bypassed (--force).")
+    else:
+        cached = load_cached_result(table_name, cache_key)
+        if cached is not None:
+            print(f"\n♻️  Cache hit ({cache_key[:12]}) → inputs unchanged, reusing previous result.")
+            print_scorecard(cached["summary"])
+            print(f"\n✅ HTML report (cached): {cached['report_path']}")
+            timer.lap("cache_lookup")
+            record_history(
+                table_name, sf_path, laweb_path, cached["summary"], timer,
+                cache_hit=True, workers=workers, backend=backend,
+            )
+            return cached["summary"]
+        print(f"\n♻️  Cache miss ({cache_key[:12]}) → running full comparison.")
+    timer.lap("cache_lookup")
+
+    # Deferred imports of the comparison stack (own stage in the timings)
+    import pandas as pd
+    from utils.file_loader import load_csv_case_insensitive
+    from compare.alignment import align_rows
+    from compare.column_comparison import compare_columns
+    from compare.column_diff import compute_column_diffs
+    from compare.datatype_comparison import compare_dtypes
+    from compare.id_comparison import compare_ids
+    from compare.kernels import get_kernels
+    from compare.keys import encode_keys
+    from compare.row_comparison import compare_rows
+    from rules.engine import evaluate_rules
+
+    # Compute kernels (results are identical across backends, so the
+    # backend is not part of the cache key)
+    get_kernels(backend)
+
+    timer.lap("imports")
+
+    if policy["fail_fast"] or policy["order"] != "config" or policy["rule_timeout_s"] or policy["table_timeout_s"]:
+        print(
+            f"⚙️  Execution policy: fail_fast={policy['fail_fast']}, order={policy['order']}, "
+            f"rule_timeout_s={policy['rule_timeout_s']}, table_timeout_s={policy['table_timeout_s']}"
+        )
+
+    if backend != "pandas":
+        print(f"🧮 Compute backend: {backend}")
+
+    # Sampled semantic schema check (before the full load)
+    schema_check = run_schema_check(sf_path, laweb_path)
+    schema_diff = schema_check["diff"]
+    timer.lap("schema_check")
+
     # Load CSVs
     sf = load_csv_case_insensitive(sf_path)
     laweb = load_csv_case_insensitive(laweb_path)
 
-    pk = primary_key.strip().upper()
-    if pk not in sf.columns:
-        raise ValueError(f"Primary key '{pk}' not found in SF columns.")
-    if pk not in laweb.columns:
-        raise ValueError(f"Primary key '{pk}' not found in LAWEB columns.")
+    for col in pk:
+        if col not in sf.columns:
+            raise ValueError(f"Primary key '{col}' not found in SF columns.")
+        if col not in laweb.columns:
+            raise ValueError(f"Primary key '{col}' not found in LAWEB columns.")
 
-    # Column comparison
-    common_cols, missing_in_sf, missing_in_laweb = compare_columns(sf, laweb)
+    timer.lap("load")
 
-    missing_html_parts = []
-    if missing_in_sf:
-        missing_html_parts.append(
-            "<h4>Columns present in LAWEB but missing in SF</h4><pre>"
-            + "\n".join(missing_in_sf)
-            + "</pre>"
-        )
-    else:
-        missing_html_parts.append("<p>No columns missing in SF.</p>")
+    # Encode the (possibly composite) key once per side; reused by the
+    # ID comparison, the row alignment and the P01 rule.
+    key_codes = encode_keys(sf, laweb, pk, backend=backend)
 
-    if missing_in_laweb:
-        missing_html_parts.append(
-            "<h4>Columns present in SF but missing in LAWEB</h4><pre>"
-            + "\n".join(missing_in_laweb)
-            + "</pre>"
-        )
-    else:
-        missing_html_parts.append("<p>No columns missing in LAWEB.</p>")
+    timer.lap("key_encoding")
+
+    # Column comparison
+    common_cols, missing_in_sf, missing_in_laweb = compare_columns(sf, laweb)
 
-    column_mismatch_html = "".join(missing_html_parts)
+    timer.lap("columns")
 
     # Dtype comparison (inferred)
     dtype_map_df = None
@@ -93,32 +338,23 @@ def run_comparison(sf_path, laweb_path, table_name, primary_key, dtype_map_path=
             dtype_map_df = None  # ignore if invalid
 
     dtype_diff_df = compare_dtypes(sf, laweb, common_cols, dtype_map_df)
-    if dtype_diff_df is not None and not dtype_diff_df.empty:
-        dtype_diff_html = dtype_diff_df.to_html(index=False)
-    else:
-        dtype_diff_html = "<p>No datatype differences detected.</p>"
+
+    timer.lap("dtypes")
 
     # ID comparison
-    ids_sf_only, ids_laweb_only = compare_ids(sf, laweb, pk)
-    id_parts = [
-        f"<h4>IDs present in SF but missing in LAWEB ({len(ids_sf_only)})</h4>"
-        + "<pre>" + "\n".join(map(str, ids_sf_only[:200])) + "</pre>",
-        f"<h4>IDs present in LAWEB but missing in SF ({len(ids_laweb_only)})</h4>"
-        + "<pre>" + "\n".join(map(str, ids_laweb_only[:200])) + "</pre>",
-    ]
-    id_diff_html = "".join(id_parts)
-
-    # Row-level comparison (sample for HTML + CM01)
-    row_diff_df = compare_rows(sf, laweb, pk, common_cols, max_mismatches=100)
-    if row_diff_df is not None and not row_diff_df.empty:
-        styled = row_diff_df.copy()
-        styled["value_sf"] = styled["value_sf"].apply(lambda v: f"<span class='sf-cell'>{v}</span>")
-        styled["value_laweb"] = styled["value_laweb"].apply(lambda v: f"<span class='lw-cell'>{v}</span>")
-        row_diff_html = styled.to_html(escape=False, index=False)
-    else:
-        row_diff_html = "<p>No row-level mismatches found (sample up to 100 rows).</p>"
+    ids_sf_only, ids_laweb_only = compare_ids(sf, laweb, pk, key_codes=key_codes)
+
+    timer.lap("ids")
+
+    # Align rows once (duplicate / NULL keys quarantined, one-to-one join)
+    aligned = align_rows(sf, laweb, pk, key_codes=key_codes, backend=backend)
+
+    timer.lap("align")
 
-    # Data Quality Rule Engine (now includes CM02 + CM03)
+    # Data Quality Rule Engine. The expensive stages (per-column mismatch
+    # matrix, row sample) are computed lazily by the rules that need them,
+    # so fail-fast / time budgets can skip them entirely.
+    stages = {"aligned": aligned}
     dq_summary = evaluate_rules(
         sf=sf,
         laweb=laweb,
@@ -128,40 +364,98 @@ def run_comparison(sf_path, laweb_path, table_name, primary_key, dtype_map_path=
         column_missing_laweb=missing_in_laweb,
         ids_sf_only=ids_sf_only,
         ids_laweb_only=ids_laweb_only,
-        row_diff=row_diff_df,
+        row_diff=None,
         enabled_rules=enabled_rules,
+        policy=policy,
+        stages=stages,
+        table_name=table_name,
+        costs_path=RULE_COSTS_PATH,
+        workers=workers,
+        backend=backend,
+        sf_path=sf_path,
+        laweb_path=laweb_path,
+        schemas={"sf": schema_check["sf"], "laweb": schema_check["laweb"]},
     )
 
+    timer.lap("rules")
+
+    # Stages abandoned after a rule timeout (or skipped by a stop) are shown
+    # as not computed rather than started again without a budget
+    not_computed = {}
+    if dq_summary["stopped_early"]:
+        not_computed = {"column_diffs": dq_summary["stopped_early"], "row_diff": dq_summary["stopped_early"]}
+    for name, reason in (stages.get("abandoned") or {}).items():
+        not_computed.setdefault(name, reason)
+    if "column_diffs" in not_computed:
+        not_computed.setdefault("row_diff", not_computed["column_diffs"])  # the row sample needs the matrix
+
+    column_diffs = None
+    if "column_diffs" not in not_computed:
+        # Per-column mismatch matrix, one pass over the aligned data (shared by
+        # CM01, CM02 and CM04); wide tables can shard it across processes
+        column_diffs = stages.get("column_diffs")
+        if column_diffs is None:
+            column_diffs = compute_column_diffs(
+                aligned, pk, common_cols, max_samples=100, workers=workers, backend=backend
+            )
+
+    row_diff_df = None
+    if "row_diff" not in not_computed:
+        # Row-level comparison (sample for HTML + CM01)
+        row_diff_df = stages.get("row_diff")
+        if row_diff_df is None:
+            row_diff_df = compare_rows(
+                sf,
+                laweb,
+                pk,
+                common_cols,
+                max_mismatches=100,
+                aligned=aligned,
+                column_diffs=column_diffs,
+                backend=backend,
+            )
+
+    timer.lap("mismatch_matrix")
+
     # Console scorecard
-    print("\n📊 Data Quality Scorecard")
-    print("------------------------")
-    print(
-        f"Overall Score: {dq_summary['score']}%\n"
-        f"Passed: {dq_summary['passed']} | "
-        f"Failed: {dq_summary['failed']} | "
-        f"Skipped: {dq_summary['skipped']} | "
-        f"Critical Failed: {dq_summary['critical_failed']}"
+    print_scorecard(dq_summary)
+
+    # Generate HTML dashboard (streamed from the template to the file)
+    report_path = create_html_report(
+        table_name=table_name,
+        dq_summary=dq_summary,
+        missing_in_sf=missing_in_sf,
+        missing_in_laweb=missing_in_laweb,
+        dtype_diff=frame_table(dtype_diff_df),
+        schema_diff=schema_diff,
+        ids_sf_only=ids_sf_only,
+        ids_laweb_only=ids_laweb_only,
+        duplicates=build_duplicate_keys_section(aligned),
+        column_diffs=column_diffs,
+        row_diff=frame_table(row_diff_df),
+        not_computed=not_computed,
     )
-    for r in dq_summary["rules"]:
-        print(f"- {r['id']} [{r['priority']}] -> {r['result']}: {r['name']}")
 
-    # Rule breakdown HTML
-    rule_table_html = build_rule_table_html(dq_summary["rules"])
+    timer.lap("report")
 
-    # Generate HTML dashboard
-    create_html_report(
-        table_name=table_name,
-        score=dq_summary["score"],
-        passed=dq_summary["passed"],
-        failed=dq_summary["failed"],
-        skipped=dq_summary["skipped"],
-        critical_failed=dq_summary["critical_failed"],
-        rule_table_html=rule_table_html,
-        missing_columns_html=column_mismatch_html,
-        dtype_diff_html=dtype_diff_html,
-        id_diff_html=id_diff_html,
-        row_diff_html=row_diff_html,
+    # A TIMEOUT depends on this run's timing, not on the inputs: don't cache it
+    if dq_summary["timed_out"]:
+        print("\n♻️  Result not cached: some rules timed out.")
+    else:
+        store_result(table_name, cache_key, dq_summary, report_path)
+    record_history(
+        table_name,
+        sf_path,
+        laweb_path,
+        dq_summary,
+        timer,
+        sf_rows=len(sf),
+        laweb_rows=len(laweb),
+        column_diffs=column_diffs or stages.get("column_diffs"),
+        workers=workers,
+        backend=backend,
     )
+    return dq_summary
 
 
 def main():
@@ -169,10 +463,73 @@ def main():
     parser.add_argument("--table", help="Table name from YAML mapping", required=False)
     parser.add_argument("--sf", help="Path to SF CSV file", required=False)
     parser.add_argument("--laweb", help="Path to LAWEB CSV file", required=False)
-    parser.add_argument("--pk", help="Primary key column name (for direct mode)", required=False)
+    parser.add_argument(
+        "--pk",
+        help="Primary key column name, comma-separated for composite keys (for direct mode)",
+        required=False,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for the column-sharded row diff (wide tables; needs pyarrow)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pandas", "arrow"],
+        default="pandas",
+        help="Compute kernels for key encoding and column diffs (arrow needs pyarrow)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Bypass the result cache and always run the full comparison",
+    )
+    parser.add_argument(
+        "--schema-only",
+        action="store_true",
+        help="Only compare semantic column types inferred from sampled chunks (no full load)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        default=None,
+        help="Stop evaluating rules after the first Critical failure",
+    )
+    parser.add_argument(
+        "--order",
+        choices=["config", "cost"],
+        help="Rule execution order: as configured, or cheapest first by measured history",
+    )
+    parser.add_argument("--rule-timeout", type=float, help="Per-rule time budget in seconds (→ TIMEOUT)")
+    parser.add_argument("--table-timeout", type=float, help="Time budget in seconds for all rules of a table")
+    parser.add_argument(
+        "--trends",
+        action="store_true",
+        help="Generate the score / runtime trends report from the run history",
+    )
+    parser.add_argument(
+        "--validate-config",
+        action="store_true",
+        help="Check table_mapping.yaml, data_quality_rules.yaml and the referenced files, then exit",
+    )
 
     args = parser.parse_args()
 
+    cli_execution = {
+        "fail_fast": args.fail_fast,
+        "order": args.order,
+        "rule_timeout_s": args.rule_timeout,
+        "table_timeout_s": args.table_timeout,
+    }
+
+    if args.validate_config:
+        sys.exit(0 if run_config_validation() else 1)
+
+    if args.trends:
+        run_trends_report()
+        return
+
     # Mode 1: YAML table-based
     if args.table:
         tables_cfg = load_table_config()
@@ -181,6 +538,8 @@ def main():
 
         entry = tables_cfg[args.table]
         enabled_rules = entry.get("rules_enabled")
+        execution = dict(entry.get("execution") or {})
+        execution.update({k: v for k, v in cli_execution.items() if v is not None})
 
         run_comparison(
             sf_path=entry["sf"],
@@ -189,6 +548,11 @@ def main():
             primary_key=entry["primary_key"],
             dtype_map_path=entry.get("dtype_map"),
             enabled_rules=enabled_rules,
+            workers=args.workers,
+            force=args.force,
+            schema_only=args.schema_only,
+            execution=execution,
+            backend=args.backend,
         )
         return
 
@@ -201,6 +565,11 @@ def main():
             primary_key=args.pk,
             dtype_map_path=None,
             enabled_rules=None,
+            workers=args.workers,
+            force=args.force,
+            schema_only=args.schema_only,
+            execution=cli_execution,
+            backend=args.backend,
         )
         return
 
@@ -1,7 +1,19 @@
-from typing import Dict, Any, List, Optional, Sequence
-import yaml
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional, Sequence, Tuple, Union
+import json
 import os
-import pandas as pd
+import threading
+import time
+import yaml
+
+from utils.config_loader import read_yaml
+
+# pandas / numpy and the compare modules are imported inside the functions
+# that need them, so loading rule configs (e.g. --validate-config) stays
+# cheap. Annotations are not evaluated at runtime.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def _weight_for_priority(priority: str) -> float:
@@ -45,41 +57,73 @@ def load_rules_config(path: str = "config/data_quality_rules.yaml") -> Dict[str,
         priority: "Medium"
         enabled: true
         threshold: 20.0
+      CM04:
+        name: "Column Mismatch Rate"
+        type: "column_mismatch_rate"
+        priority: "Medium"
+        enabled: true
+        max_rate_pct: 0.1
+        columns: [...]        # optional, default: all common columns
+      SK01:
+        name: "Distinct Count Drift"
+        type: "distinct_count"    # also "quantile", "heavy_hitters" (sketch-based)
+        priority: "Medium"
+        enabled: true
+        tolerance_pct: 1.0
+        columns: [...]        # optional, default: all common columns
     """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Rules configuration not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = read_yaml(path)
 
     return data.get("rules", {})
 
 
+def _count_duplicate_keys(codes) -> int:
+    """
+    Number of rows whose (non-NULL) encoded key occurs more than once.
+    """
+    import pandas as pd
+
+    return int((pd.Series(codes).duplicated(keep=False) & (codes >= 0)).sum())
+
+
 def _compute_full_row_mismatch_count(
     sf: pd.DataFrame,
     laweb: pd.DataFrame,
-    pk: str,
+    pk: Union[str, Sequence[str]],
     common_cols: List[str],
+    aligned: Optional[Dict[str, Any]] = None,
+    backend: str = "pandas",
 ) -> int:
     """
-    Compute how many joined rows (by PK) have at least one differing value
+    Compute how many aligned rows (by PK) have at least one differing value
     across any of the common columns.
+
+    Rows with duplicate or NULL keys are quarantined by align_rows and are
+    not part of this count.
     """
-    pk = pk.strip().upper()
-    merged = sf.merge(laweb, on=pk, how="inner", suffixes=("_SF", "_LAWEB"))
-    if merged.empty:
+    import numpy as np
+    from compare.alignment import align_rows
+    from compare.kernels import get_kernels
+    from compare.keys import normalize_primary_key
+
+    pk_cols = normalize_primary_key(pk)
+    if aligned is None:
+        aligned = align_rows(sf, laweb, pk_cols, backend=backend)
+    sf_al = aligned["sf"]
+    lw_al = aligned["laweb"]
+    if sf_al.empty:
         return 0
 
-    mismatch_mask = pd.Series(False, index=merged.index)
+    kernels = get_kernels(backend)
+    mismatch_mask = np.zeros(len(sf_al), dtype=bool)
 
     for col in common_cols:
-        col_sf = f"{col}_SF"
-        col_lw = f"{col}_LAWEB"
-        if col_sf not in merged.columns or col_lw not in merged.columns:
+        if col in pk_cols or col not in sf_al.columns or col not in lw_al.columns:
             continue
-        a = merged[col_sf].fillna("__NA__")
-        b = merged[col_lw].fillna("__NA__")
-        mismatch_mask = mismatch_mask | (a != b)
+        mismatch_mask |= kernels.mismatch_mask(sf_al[col], lw_al[col])
 
     return int(mismatch_mask.sum())
 
@@ -89,16 +133,20 @@ def _compute_null_pattern_violations(
     laweb: pd.DataFrame,
     common_cols: List[str],
     threshold_pct: float = 20.0,
+    backend: str = "pandas",
 ) -> List[Dict[str, Any]]:
     """
     For each common column, compare NULL percentage between SF and LAWEB.
     Returns a list of columns where the difference exceeds threshold_pct.
     """
+    from compare.kernels import get_kernels
+
+    kernels = get_kernels(backend)
     violations: List[Dict[str, Any]] = []
 
     for col in common_cols:
-        sf_null_pct = float(sf[col].isna().mean() * 100.0)
-        lw_null_pct = float(laweb[col].isna().mean() * 100.0)
+        sf_null_pct = _null_pct(kernels, sf[col])
+        lw_null_pct = _null_pct(kernels, laweb[col])
         diff_pct = abs(sf_null_pct - lw_null_pct)
 
         if diff_pct > threshold_pct:
@@ -116,185 +164,853 @@ def _compute_null_pattern_violations(
     return violations
 
 
+def _null_pct(kernels, values: pd.Series) -> float:
+    if len(values) == 0:
+        return float("nan")
+    return float(kernels.null_mask(values).mean() * 100.0)
+
+
+def _compute_column_rate_violations(
+    column_diffs: Dict[str, Any],
+    max_rate_pct: float,
+    columns: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Columns of the mismatch matrix (compare.column_diff.compute_column_diffs)
+    whose mismatch rate exceeds max_rate_pct, worst first.
+    `columns` restricts the check; default is every compared column.
+    """
+    wanted = None if columns is None else {c.strip().upper() for c in columns}
+    violations = [
+        s for s in column_diffs["columns"]
+        if (wanted is None or s["column"] in wanted) and s["rate_pct"] > max_rate_pct
+    ]
+    violations.sort(key=lambda s: s["rate_pct"], reverse=True)
+    return violations
+
+
+# ---------------------------------------------------------------------------
+# Rule handlers: (rule_def, ctx) -> (result, details)
+#
+# `ctx` holds the evaluate_rules inputs plus a "stages" dict of lazily
+# computed, shared intermediate results (alignment, column diffs, ...).
+# ---------------------------------------------------------------------------
+
+
+class StageAbandoned(RuntimeError):
+    """A shared stage was given up because a rule computing it timed out."""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"stage '{stage}' abandoned: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+def _run_stage(ctx: Dict[str, Any], name: str, compute: Callable[[], Any]) -> Any:
+    """
+    Compute a shared stage once and store it in ctx["stages"].
+
+    A stage that was running in a rule's thread when the rule timed out is
+    recorded in stages["abandoned"] ({name: reason}): later rules (and
+    run_comparison) do not start it again, and the abandoned thread neither
+    starts new stages nor stores its late result.
+
+    The stage's own runtime (excluding the stages it pulls in) goes to
+    ctx["stage_costs"] and the stages it pulls in to ctx["stage_deps"];
+    the rule running in this thread records the stage as used, so its
+    cost can be charged to every rule that needs it (see _rule_cost).
+    """
+    stages = ctx["stages"]
+    me = threading.get_ident()
+    usage = ctx["stage_usage"].get(me)
+    if usage is not None:
+        usage["stages"].add(name)
+        if usage["stack"]:
+            usage["stack"][-1]["deps"].add(name)
+    if stages.get(name) is not None:
+        return stages[name]
+
+    lock = ctx["stage_lock"]
+    abandoned = stages.setdefault("abandoned", {})
+    with lock:
+        if name in abandoned:
+            raise StageAbandoned(name, abandoned[name])
+        if me in ctx["cancelled_threads"]:
+            raise StageAbandoned(name, "its rule timed out")
+        ctx["running_stages"][name] = me
+
+    frame = {"deps": set(), "nested_s": 0.0}
+    if usage is not None:
+        usage["stack"].append(frame)
+    t0 = time.perf_counter()
+    try:
+        value = compute()
+    finally:
+        elapsed = time.perf_counter() - t0
+        with lock:
+            ctx["running_stages"].pop(name, None)
+        if usage is not None:
+            usage["stack"].pop()
+            if usage["stack"]:
+                usage["stack"][-1]["nested_s"] += elapsed
+            else:
+                usage["stage_s"] += elapsed
+    with lock:
+        if name in abandoned or me in ctx["cancelled_threads"]:
+            raise StageAbandoned(name, abandoned.get(name, "its rule timed out"))
+        stages[name] = value
+        ctx["stage_costs"][name] = elapsed - frame["nested_s"]
+        ctx["stage_deps"][name] = frame["deps"]
+    return value
+
+
+def _tracked(handler: Callable[[Dict[str, Any], Dict[str, Any]], Tuple[str, str]], usage: Dict[str, Any]):
+    """Wrap a rule handler so the stages it touches are recorded in `usage`."""
+    def run(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+        with ctx["stage_lock"]:
+            ctx["stage_usage"][threading.get_ident()] = usage
+        return handler(rule_def, ctx)
+
+    return run
+
+
+def _rule_cost(ctx: Dict[str, Any], usage: Dict[str, Any], duration: float) -> float:
+    """
+    Cost of a rule independent of execution order: its own runtime (stage
+    computations excluded) plus the cost of every stage it needs, directly
+    or through other stages, whichever rule actually computed them.
+    """
+    needed, todo = set(), list(usage["stages"])
+    while todo:
+        name = todo.pop()
+        if name not in needed:
+            needed.add(name)
+            todo.extend(ctx["stage_deps"].get(name, ()))
+    own = max(duration - usage["stage_s"], 0.0)
+    return own + sum(ctx["stage_costs"].get(name, 0.0) for name in needed)
+
+
+def _cancel_event(ctx: Dict[str, Any]) -> threading.Event:
+    """Event set once the calling rule's thread is abandoned, for stages that can stop early."""
+    with ctx["stage_lock"]:
+        return ctx["cancel_events"].setdefault(threading.get_ident(), threading.Event())
+
+
+def _abandon_thread(ctx: Dict[str, Any], thread_id: int, reason: str) -> None:
+    """Mark a timed-out rule's thread as cancelled and its running stages as abandoned."""
+    with ctx["stage_lock"]:
+        ctx["cancelled_threads"].add(thread_id)
+        ctx["cancel_events"].setdefault(thread_id, threading.Event()).set()
+        abandoned = ctx["stages"].setdefault("abandoned", {})
+        for name, owner in list(ctx["running_stages"].items()):
+            if owner == thread_id:
+                abandoned[name] = reason
+
+
+def _stage_aligned(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    def compute():
+        from compare.alignment import align_rows
+
+        return align_rows(ctx["sf"], ctx["laweb"], ctx["pk_cols"], backend=ctx["backend"])
+
+    return _run_stage(ctx, "aligned", compute)
+
+
+def _stage_column_diffs(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    def compute():
+        from compare.column_diff import compute_column_diffs
+
+        return compute_column_diffs(
+            _stage_aligned(ctx),
+            ctx["pk_cols"],
+            ctx["common_cols"],
+            workers=ctx["workers"],
+            backend=ctx["backend"],
+            cancel=_cancel_event(ctx),
+        )
+
+    return _run_stage(ctx, "column_diffs", compute)
+
+
+def _stage_row_diff(ctx: Dict[str, Any]) -> pd.DataFrame:
+    def compute():
+        from compare.row_comparison import compare_rows
+
+        return compare_rows(
+            ctx["sf"],
+            ctx["laweb"],
+            ctx["pk_cols"],
+            ctx["common_cols"],
+            max_mismatches=100,
+            aligned=_stage_aligned(ctx),
+            column_diffs=_stage_column_diffs(ctx),
+            backend=ctx["backend"],
+        )
+
+    return _run_stage(ctx, "row_diff", compute)
+
+
+def _stage_sketches(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Per-column sketches of both sides (compare.sketches), built from the
+    loaded DataFrames. When the source paths are known they are persisted
+    per file, and files sketched on an earlier run are not sketched again.
+    """
+    def compute():
+        from compare.sketches import sketch_dataframe, sketch_files
+
+        sketches = {}
+        for side in ("sf", "laweb"):
+            schema = ctx["schemas"].get(side)
+            if ctx.get(f"{side}_path"):
+                sketches[side] = sketch_files(ctx[f"{side}_path"], schema=schema, frame=ctx[side])
+            else:
+                sketches[side] = sketch_dataframe(ctx[side], schema=schema)
+        return sketches
+
+    return _run_stage(ctx, "sketches", compute)
+
+
+def _rule_row_count(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    tolerance = rule_def.get("tolerance", 0)
+    sf_rows = len(ctx["sf"])
+    lw_rows = len(ctx["laweb"])
+    diff = abs(sf_rows - lw_rows)
+    if diff <= tolerance:
+        return "PASS", f"Row count match (SF={sf_rows}, LAWEB={lw_rows}, diff={diff}, tol={tolerance})."
+    return "FAIL", f"Row count mismatch (SF={sf_rows}, LAWEB={lw_rows}, diff={diff})."
+
+
+def _rule_missing_ids(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    ids_sf_only = ctx["ids_sf_only"]
+    if len(ids_sf_only) == 0:
+        return "PASS", "No IDs missing in LAWEB."
+    return "FAIL", f"{len(ids_sf_only)} IDs present in SF but missing in LAWEB."
+
+
+def _rule_extra_ids(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    ids_laweb_only = ctx["ids_laweb_only"]
+    if len(ids_laweb_only) == 0:
+        return "PASS", "No extra IDs in LAWEB."
+    return "FAIL", f"{len(ids_laweb_only)} IDs present in LAWEB but missing in SF."
+
+
+def _rule_column_count(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    sf_cols = len(ctx["sf"].columns)
+    lw_cols = len(ctx["laweb"].columns)
+    if sf_cols == lw_cols:
+        return "PASS", f"Column counts match (SF={sf_cols}, LAWEB={lw_cols})."
+    return "FAIL", f"Column counts differ (SF={sf_cols}, LAWEB={lw_cols})."
+
+
+def _rule_column_names(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    column_missing_sf = ctx["column_missing_sf"]
+    column_missing_laweb = ctx["column_missing_laweb"]
+    if not column_missing_sf and not column_missing_laweb:
+        return "PASS", "All column names match."
+    return "FAIL", (
+        f"Missing in SF: {len(column_missing_sf)}, "
+        f"missing in LAWEB: {len(column_missing_laweb)}."
+    )
+
+
+def _rule_pk_unique(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    stages = ctx["stages"]
+    if stages.get("aligned") is not None:
+        key_codes = stages["aligned"]["key_codes"]
+    else:
+        from compare.keys import encode_keys
+
+        key_codes = encode_keys(ctx["sf"], ctx["laweb"], ctx["pk_cols"], backend=ctx["backend"])
+    sf_dup = _count_duplicate_keys(key_codes["sf"])
+    lw_dup = _count_duplicate_keys(key_codes["laweb"])
+    if sf_dup == 0 and lw_dup == 0:
+        return "PASS", "Primary key is unique in both datasets."
+    return "FAIL", (
+        f"Duplicate PK values - SF={sf_dup}, LAWEB={lw_dup}. "
+        f"Rows with duplicate keys are quarantined from the row comparison."
+    )
+
+
+def _rule_pk_not_null(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    pk_cols = ctx["pk_cols"]
+    sf_null = int(ctx["sf"][pk_cols].isna().any(axis=1).sum())
+    lw_null = int(ctx["laweb"][pk_cols].isna().any(axis=1).sum())
+    if sf_null == 0 and lw_null == 0:
+        return "PASS", "Primary key has no NULL values in both datasets."
+    return "FAIL", f"NULL PK values - SF={sf_null}, LAWEB={lw_null}."
+
+
+def _rule_sample_row_compare(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    row_diff = _stage_row_diff(ctx)
+    if row_diff is None or row_diff.empty:
+        return "PASS", "No row-level mismatches detected in sample."
+    return "FAIL", f"{len(row_diff)} row-level mismatches detected (sample, max 100 shown)."
+
+
+def _rule_full_row_compare(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    stages = ctx["stages"]
+    if stages.get("column_diffs") is not None:
+        full_mismatch_count = stages["column_diffs"]["row_mismatch_count"]
+    else:
+        full_mismatch_count = _compute_full_row_mismatch_count(
+            ctx["sf"],
+            ctx["laweb"],
+            ctx["pk_cols"],
+            ctx["common_cols"],
+            aligned=_stage_aligned(ctx),
+            backend=ctx["backend"],
+        )
+    if full_mismatch_count == 0:
+        return "PASS", "All matched rows are identical across all common columns."
+    return "FAIL", f"{full_mismatch_count} joined rows have at least one differing column value."
+
+
+def _rule_null_pattern(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    threshold = float(rule_def.get("threshold", 20.0))
+    cache = ctx["stages"].setdefault("null_pattern", {})
+    if threshold not in cache:
+        cache[threshold] = _compute_null_pattern_violations(
+            ctx["sf"], ctx["laweb"], ctx["common_cols"], threshold, backend=ctx["backend"]
+        )
+    violations = cache[threshold]
+    if not violations:
+        return "PASS", f"NULL pattern consistent within ±{threshold}% for all common columns."
+    sample_str = ", ".join(
+        f"{v['column']} (SF={v['sf_null_pct']}%, LAWEB={v['laweb_null_pct']}%, Δ={v['diff_pct']}%)"
+        for v in violations[:3]
+    )
+    return "FAIL", (
+        f"NULL pattern differs by more than {threshold}% in "
+        f"{len(violations)} columns. Top examples: {sample_str}"
+    )
+
+
+def _rule_column_mismatch_rate(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    max_rate = float(rule_def.get("max_rate_pct", 0.0))
+    violations = _compute_column_rate_violations(
+        _stage_column_diffs(ctx), max_rate, rule_def.get("columns")
+    )
+    if not violations:
+        return "PASS", f"Mismatch rate within {max_rate}% for all checked columns."
+    sample_str = ", ".join(
+        f"{v['column']} ({v['rate_pct']:.3g}%, {v['mismatches']} rows)"
+        for v in violations[:3]
+    )
+    return "FAIL", (
+        f"Mismatch rate above {max_rate}% in {len(violations)} columns. "
+        f"Worst: {sample_str}"
+    )
+
+
+def _sketch_columns(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> List[str]:
+    """Common columns checked by a sketch rule (optional `columns` list)."""
+    columns = rule_def.get("columns")
+    if columns is None:
+        return list(ctx["common_cols"])
+    common = set(ctx["common_cols"])
+    return [c.strip().upper() for c in columns if c.strip().upper() in common]
+
+
+def _format_sketch_value(value: Optional[float], kind: str) -> str:
+    if value is None:
+        return "n/a"
+    if kind == "datetime":
+        import pandas as pd
+
+        return str(pd.Timestamp(int(value)))
+    return f"{value:.6g}"
+
+
+def _rule_distinct_count(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    tolerance = float(rule_def.get("tolerance_pct", 1.0))
+    columns = _sketch_columns(rule_def, ctx)
+    if not columns:
+        return "SKIPPED", "None of the configured columns is present on both sides."
+
+    sketches = _stage_sketches(ctx)
+    violations = []
+    for col in columns:
+        sf_distinct = sketches["sf"]["columns"][col]["hll"].estimate()
+        lw_distinct = sketches["laweb"]["columns"][col]["hll"].estimate()
+        diff_pct = abs(lw_distinct - sf_distinct) / max(sf_distinct, 1.0) * 100.0
+        if diff_pct > tolerance:
+            violations.append((col, sf_distinct, lw_distinct, diff_pct))
+
+    if not violations:
+        return "PASS", f"Estimated distinct counts within {tolerance}% for {len(columns)} columns."
+    violations.sort(key=lambda v: v[3], reverse=True)
+    sample_str = ", ".join(f"{c} (SF≈{sf:.0f}, LAWEB≈{lw:.0f}, Δ={d:.2f}%)" for c, sf, lw, d in violations[:3])
+    return "FAIL", (
+        f"Estimated distinct count differs by more than {tolerance}% in "
+        f"{len(violations)} columns. Worst: {sample_str}"
+    )
+
+
+def _rule_quantile(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    tolerance = float(rule_def.get("tolerance_pct", 1.0))
+    quantiles = [float(q) for q in rule_def.get("quantiles", [0.5, 0.99])]
+    columns = _sketch_columns(rule_def, ctx)
+    if not columns:
+        return "SKIPPED", "None of the configured columns is present on both sides."
+
+    sketches = _stage_sketches(ctx)
+    sf_cols, lw_cols = sketches["sf"]["columns"], sketches["laweb"]["columns"]
+    # Quantiles only apply to columns that are numeric / dates on at least one side
+    columns = [c for c in columns if sf_cols[c]["kind"] is not None or lw_cols[c]["kind"] is not None]
+    if not columns:
+        return "SKIPPED", "No numeric or date columns to compare."
+
+    violations = []
+    for col in columns:
+        sf, lw = sf_cols[col], lw_cols[col]
+        if sf["kind"] != lw["kind"]:
+            violations.append(f"{col} (SF is {sf['kind'] or 'text'}, LAWEB is {lw['kind'] or 'text'})")
+            continue
+        if sf["kll"].n == 0 or lw["kll"].n == 0:
+            continue
+        value_range = (sf["kll"].max - sf["kll"].min) or 1.0
+        for q in quantiles:
+            sf_q, lw_q = sf["kll"].quantile(q), lw["kll"].quantile(q)
+            diff_pct = abs(lw_q - sf_q) / value_range * 100.0
+            if diff_pct > tolerance:
+                violations.append(
+                    f"{col} p{q * 100:g} (SF={_format_sketch_value(sf_q, sf['kind'])}, "
+                    f"LAWEB={_format_sketch_value(lw_q, lw['kind'])}, Δ={diff_pct:.2f}% of range)"
+                )
+
+    if not violations:
+        return "PASS", (
+            f"Quantiles {', '.join(f'p{q * 100:g}' for q in quantiles)} within {tolerance}% "
+            f"of the SF value range for {len(columns)} columns."
+        )
+    return "FAIL", (
+        f"{len(violations)} quantile checks differ by more than {tolerance}% of the SF range. "
+        f"Top examples: {', '.join(violations[:3])}"
+    )
+
+
+def _rule_heavy_hitters(rule_def: Dict[str, Any], ctx: Dict[str, Any]) -> Tuple[str, str]:
+    tolerance = float(rule_def.get("tolerance_pct", 1.0))
+    top_k = int(rule_def.get("top_k", 5))
+    columns = _sketch_columns(rule_def, ctx)
+    if not columns:
+        return "SKIPPED", "None of the configured columns is present on both sides."
+
+    sketches = _stage_sketches(ctx)
+    violations = []
+    for col in columns:
+        sf_cms = sketches["sf"]["columns"][col]["cms"]
+        lw_cms = sketches["laweb"]["columns"][col]["cms"]
+        if sf_cms.total == 0 or lw_cms.total == 0:
+            continue
+        # Most frequent values of either side, compared as shares of non-null rows
+        values = list(dict.fromkeys(
+            [h["value"] for h in sf_cms.heavy_hitters(top_k)] + [h["value"] for h in lw_cms.heavy_hitters(top_k)]
+        ))
+        sf_share = sf_cms.estimate(values) / sf_cms.total * 100.0
+        lw_share = lw_cms.estimate(values) / lw_cms.total * 100.0
+        worst = int(abs(sf_share - lw_share).argmax())
+        diff = abs(sf_share[worst] - lw_share[worst])
+        if diff > tolerance:
+            violations.append((col, values[worst], sf_share[worst], lw_share[worst], diff))
+
+    if not violations:
+        return "PASS", f"Top-{top_k} value frequencies within {tolerance} points for {len(columns)} columns."
+    violations.sort(key=lambda v: v[4], reverse=True)
+    sample_str = ", ".join(
+        f"{c} '{v}' (SF={sf:.2f}%, LAWEB={lw:.2f}%)" for c, v, sf, lw, _ in violations[:3]
+    )
+    return "FAIL", (
+        f"Frequent-value share differs by more than {tolerance} points in "
+        f"{len(violations)} columns. Worst: {sample_str}"
+    )
+
+
+RULE_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Tuple[str, str]]] = {
+    "row_count": _rule_row_count,
+    "missing_ids": _rule_missing_ids,
+    "extra_ids": _rule_extra_ids,
+    "column_count": _rule_column_count,
+    "column_names": _rule_column_names,
+    "pk_unique": _rule_pk_unique,
+    "pk_not_null": _rule_pk_not_null,
+    "sample_row_compare": _rule_sample_row_compare,
+    "full_row_compare": _rule_full_row_compare,
+    "null_pattern": _rule_null_pattern,
+    "column_mismatch_rate": _rule_column_mismatch_rate,
+    "distinct_count": _rule_distinct_count,
+    "quantile": _rule_quantile,
+    "heavy_hitters": _rule_heavy_hitters,
+}
+
+# Relative cost guesses (seconds-ish) for rules with no measured history yet,
+# so cheapest-first ordering is sensible on the very first run.
+_DEFAULT_RULE_COST = {
+    "row_count": 0.0,
+    "column_count": 0.0,
+    "column_names": 0.0,
+    "missing_ids": 0.0,
+    "extra_ids": 0.0,
+    "pk_not_null": 0.01,
+    "pk_unique": 0.02,
+    "null_pattern": 0.1,
+    "sample_row_compare": 1.0,
+    "column_mismatch_rate": 1.0,
+    "full_row_compare": 1.0,
+    "distinct_count": 0.5,
+    "quantile": 0.5,
+    "heavy_hitters": 0.5,
+}
+
+
+# ---------------------------------------------------------------------------
+# Execution policy & rule cost history
+# ---------------------------------------------------------------------------
+
+DEFAULT_EXECUTION_POLICY: Dict[str, Any] = {
+    "fail_fast": False,       # stop after the first Critical rule failure
+    "order": "config",        # "config" or "cost" (cheapest first, measured history)
+    "rule_timeout_s": None,   # per-rule time budget → TIMEOUT
+    "table_timeout_s": None,  # budget for all rules of one table → TIMEOUT
+}
+
+
+def load_execution_policy(
+    path: str = "config/data_quality_rules.yaml",
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Effective execution policy: DEFAULT_EXECUTION_POLICY, updated with the
+    optional top-level `execution:` section of the rules YAML, then with
+    `overrides` (table_mapping.yaml entry / CLI flags; None values ignored).
+    """
+    policy = dict(DEFAULT_EXECUTION_POLICY)
+
+    if os.path.exists(path):
+        data = read_yaml(path)
+        policy.update(data.get("execution") or {})
+
+    for key, value in (overrides or {}).items():
+        if value is not None:
+            policy[key] = value
+
+    unknown = sorted(set(policy) - set(DEFAULT_EXECUTION_POLICY))
+    if unknown:
+        raise ValueError(f"Unknown execution setting(s): {', '.join(map(str, unknown))}.")
+    if policy["order"] not in ("config", "cost"):
+        raise ValueError(f"Unknown rule order '{policy['order']}' (expected 'config' or 'cost').")
+    for key in ("rule_timeout_s", "table_timeout_s"):
+        value = policy[key]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            raise ValueError(f"Execution setting '{key}' must be a positive number of seconds, got {value!r}.")
+    return policy
+
+
+_PRIORITIES = ("critical", "high", "medium", "low")
+_NUMERIC_RULE_PARAMS = ("tolerance", "threshold", "max_rate_pct", "tolerance_pct", "top_k")
+
+
+def validate_rules_config(path: str = "config/data_quality_rules.yaml") -> List[str]:
+    """
+    Check the rules YAML without running anything: every rule has a known
+    type and priority and numeric parameters, and the `execution:` section
+    is a valid policy. Returns a list of problems (empty when valid).
+    """
+    try:
+        rules_cfg = load_rules_config(path)
+        load_execution_policy(path)
+    except (OSError, ValueError, yaml.YAMLError) as exc:
+        return [str(exc)]
+
+    if not isinstance(rules_cfg, dict):
+        return [f"{path}: 'rules:' must be a mapping of rule IDs."]
+
+    problems = []
+    for rule_id, rule_def in rules_cfg.items():
+        if not isinstance(rule_def, dict):
+            problems.append(f"Rule {rule_id}: definition must be a mapping.")
+            continue
+        rule_type = rule_def.get("type")
+        if rule_type not in RULE_HANDLERS:
+            problems.append(f"Rule {rule_id}: unknown type '{rule_type}'.")
+        priority = str(rule_def.get("priority", "")).strip().lower()
+        if priority not in _PRIORITIES:
+            problems.append(f"Rule {rule_id}: unknown priority '{rule_def.get('priority')}'.")
+        for param in _NUMERIC_RULE_PARAMS:
+            value = rule_def.get(param)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                problems.append(f"Rule {rule_id}: '{param}' must be a number, got {value!r}.")
+        quantiles = rule_def.get("quantiles")
+        if quantiles is not None and not (
+            isinstance(quantiles, list)
+            and all(isinstance(q, (int, float)) and not isinstance(q, bool) and 0 <= q <= 1 for q in quantiles)
+        ):
+            problems.append(f"Rule {rule_id}: 'quantiles' must be a list of numbers in [0, 1], got {quantiles!r}.")
+    return problems
+
+
+def load_rule_costs(path: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Measured rule runtimes: {table_name: {rule_id: seconds}}.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_rule_costs(path: Optional[str], costs: Dict[str, Dict[str, float]]) -> None:
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(costs, f, indent=2, sort_keys=True)
+
+
+def _run_with_timeout(
+    handler: Callable[[Dict[str, Any], Dict[str, Any]], Tuple[str, str]],
+    rule_def: Dict[str, Any],
+    ctx: Dict[str, Any],
+    timeout_s: Optional[float],
+    abandon_reason: str = "a rule timed out while computing it",
+) -> Optional[Tuple[str, str]]:
+    """
+    Run a rule handler, giving up after timeout_s seconds.
+    Returns None on timeout. The overrunning rule keeps running in a
+    daemon thread, but its result is discarded and the batch moves on;
+    the stages it was computing are abandoned (see _run_stage) and its
+    cancel event is set, so a sharded column diff stops its workers.
+    """
+    if timeout_s is None:
+        return handler(rule_def, ctx)
+
+    outcome: Dict[str, Any] = {}
+
+    def target():
+        try:
+            outcome["value"] = handler(rule_def, ctx)
+        except BaseException as exc:  # re-raised in the calling thread
+            outcome["error"] = exc
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(max(timeout_s, 0.0))
+
+    if worker.is_alive():
+        _abandon_thread(ctx, worker.ident, abandon_reason)
+        return None
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
 def evaluate_rules(
     sf: pd.DataFrame,
     laweb: pd.DataFrame,
     common_cols: List[str],
-    pk: str,
+    pk: Union[str, Sequence[str]],
     column_missing_sf: List[str],
     column_missing_laweb: List[str],
     ids_sf_only: List[Any],
     ids_laweb_only: List[Any],
-    row_diff: pd.DataFrame,
+    row_diff: Optional[pd.DataFrame],
     enabled_rules: Optional[Sequence[str]] = None,
     rules_path: str = "config/data_quality_rules.yaml",
+    aligned: Optional[Dict[str, Any]] = None,
+    column_diffs: Optional[Dict[str, Any]] = None,
+    policy: Optional[Dict[str, Any]] = None,
+    stages: Optional[Dict[str, Any]] = None,
+    table_name: str = "",
+    costs_path: Optional[str] = None,
+    workers: int = 1,
+    backend: str = "pandas",
+    sf_path: Optional[str] = None,
+    laweb_path: Optional[str] = None,
+    schemas: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Evaluate configured rules and return summary & per-rule results.
 
+    `pk` may be a single column or a composite key (list / comma-separated).
+    `row_diff`, `aligned` (compare.alignment.align_rows) and `column_diffs`
+    (compare.column_diff.compute_column_diffs) are optional: whatever is
+    not passed in is computed on demand, only by the rules that need it.
+    Pass a `stages` dict to share / get back those lazily computed
+    intermediate results (keys: aligned, column_diffs, row_diff, sketches;
+    "abandoned" maps stages given up after a rule timeout to the reason).
+    `workers` and `backend` are passed on to the stages computed here.
+    `sf_path` / `laweb_path` (a file or a list of partition files) let the
+    sketch rules persist per-file sketches (built from the loaded
+    DataFrames, so the files are not read again) and reuse them on later
+    runs. `schemas` ({"sf": ..., "laweb": ...}, as inferred by
+    compare.schema_inference.infer_schema for the schema check) types the
+    text columns of the sketches without sampling them again.
+
+    `policy` (see load_execution_policy) controls execution:
+      - fail_fast: after the first Critical FAIL the remaining rules are
+        SKIPPED instead of run.
+      - order: "cost" runs rules cheapest-first, using the costs measured
+        on previous runs of `table_name` (stored in `costs_path`). A rule's
+        cost includes the shared stages it needs, even when an earlier rule
+        computed them, so the order does not flip between runs.
+      - rule_timeout_s / table_timeout_s: rules running past their budget,
+        or not started before the table budget ran out, are marked TIMEOUT.
+        Stages a timed-out rule was computing are abandoned: rules that
+        need them are marked TIMEOUT too instead of starting them again.
+    Results are always reported in config order. TIMEOUT rules count as
+    not passed in the score; SKIPPED ones are left out of it.
+
     Returns dict:
       {
         "score": float,
         "passed": int,
         "failed": int,
         "skipped": int,
+        "timed_out": int,
         "critical_failed": int,
-        "rules": [ {id, name, priority, result, details}, ... ]
+        "stopped_early": str | None,   # why later rules were not run
+        "rules": [ {id, name, priority, result, details, duration_s}, ... ]
       }
     """
-    pk = pk.strip().upper()
+    from compare.keys import normalize_primary_key
+
+    pk_cols = normalize_primary_key(pk)
+    policy = policy or dict(DEFAULT_EXECUTION_POLICY)
 
     rules_cfg = load_rules_config(rules_path)
 
-    sf_rows = len(sf)
-    lw_rows = len(laweb)
-    sf_cols = len(sf.columns)
-    lw_cols = len(laweb.columns)
+    if stages is None:
+        stages = {}
+    for key, value in (("aligned", aligned), ("column_diffs", column_diffs), ("row_diff", row_diff)):
+        if value is not None:
+            stages[key] = value
 
-    results: List[Dict[str, Any]] = []
-    passed = failed = skipped = critical_failed = 0
-    total_weight = 0.0
-    gained_weight = 0.0
+    ctx: Dict[str, Any] = {
+        "sf": sf,
+        "laweb": laweb,
+        "common_cols": common_cols,
+        "pk_cols": pk_cols,
+        "column_missing_sf": column_missing_sf,
+        "column_missing_laweb": column_missing_laweb,
+        "ids_sf_only": ids_sf_only,
+        "ids_laweb_only": ids_laweb_only,
+        "workers": workers,
+        "backend": backend,
+        "sf_path": sf_path,
+        "laweb_path": laweb_path,
+        "schemas": schemas or {},
+        "stages": stages,
+        "stage_lock": threading.Lock(),
+        "cancelled_threads": set(),
+        "running_stages": {},
+        "cancel_events": {},
+        "stage_usage": {},
+        "stage_costs": {},
+        "stage_deps": {},
+    }
 
-    full_mismatch_count: Optional[int] = None  # for CM02
-    null_pattern_cache: Optional[List[Dict[str, Any]]] = None  # for CM03
+    # Per-table rule filtering (from table_mapping.yaml): filtered-out rules
+    # are completely ignored, not even SKIPPED
+    selected = [
+        (rule_id, rule_def) for rule_id, rule_def in rules_cfg.items()
+        if enabled_rules is None or rule_id in enabled_rules
+    ]
 
-    for rule_id, rule_def in rules_cfg.items():
-        # Per-table rule filtering (from table_mapping.yaml)
-        if enabled_rules is not None and rule_id not in enabled_rules:
-            continue  # completely ignore, not even SKIPPED
+    all_costs = load_rule_costs(costs_path)
+    table_costs = all_costs.setdefault(table_name, {})
 
-        enabled = rule_def.get("enabled", True)
-        name = rule_def.get("name", "")
-        priority = rule_def.get("priority", "Medium")
-        r_type = rule_def.get("type", "").strip()
-        tolerance = rule_def.get("tolerance", 0)
+    execution_order = list(selected)
+    if policy["order"] == "cost":
+        def expected_cost(item):
+            rule_id, rule_def = item
+            if rule_id in table_costs:
+                return table_costs[rule_id]
+            return _DEFAULT_RULE_COST.get(rule_def.get("type", "").strip(), 1.0)
+        execution_order.sort(key=expected_cost)
 
-        if not enabled:
-            results.append(
-                {
-                    "id": rule_id,
-                    "name": name,
-                    "priority": priority,
-                    "result": "SKIPPED",
-                    "details": "Rule disabled in config.",
-                }
-            )
-            skipped += 1
-            continue
+    rule_timeout = policy.get("rule_timeout_s")
+    table_timeout = policy.get("table_timeout_s")
+    started = time.perf_counter()
 
-        weight = _weight_for_priority(priority)
-        result = "SKIPPED"
-        details = ""
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    stopped_early: Optional[str] = None
+    stopped_result = "SKIPPED"  # result given to the rules that were not run
 
-        # -------------- RULE LOGIC --------------
+    for rule_id, rule_def in execution_order:
+        r_type = rule_def.get("type", "").strip()
+        priority = rule_def.get("priority", "Medium")
+        duration = 0.0
 
-        if r_type == "row_count":
-            diff = abs(sf_rows - lw_rows)
-            if diff <= tolerance:
-                result = "PASS"
-                details = f"Row count match (SF={sf_rows}, LAWEB={lw_rows}, diff={diff}, tol={tolerance})."
-            else:
-                result = "FAIL"
-                details = f"Row count mismatch (SF={sf_rows}, LAWEB={lw_rows}, diff={diff})."
+        if not rule_def.get("enabled", True):
+            result, details = "SKIPPED", "Rule disabled in config."
+        elif stopped_early is not None:
+            result, details = stopped_result, f"Not run: {stopped_early}"
+        elif r_type not in RULE_HANDLERS:
+            result, details = "SKIPPED", f"Unknown or not implemented rule type '{r_type}'."
+        else:
+            budget = rule_timeout
+            if table_timeout is not None:
+                remaining = table_timeout - (time.perf_counter() - started)
+                budget = remaining if budget is None else min(budget, remaining)
 
-        elif r_type == "missing_ids":
-            if len(ids_sf_only) == 0:
-                result = "PASS"
-                details = "No IDs missing in LAWEB."
+            if budget is not None and budget <= 0:
+                stopped_early = f"table time budget of {table_timeout}s exhausted."
+                stopped_result = "TIMEOUT"
+                result, details = "TIMEOUT", f"Not run: {stopped_early}"
             else:
-                result = "FAIL"
-                details = f"{len(ids_sf_only)} IDs present in SF but missing in LAWEB."
+                usage = {"stages": set(), "stage_s": 0.0, "stack": []}
+                t0 = time.perf_counter()
+                try:
+                    outcome = _run_with_timeout(
+                        _tracked(RULE_HANDLERS[r_type], usage), rule_def, ctx, budget,
+                        abandon_reason=f"rule {rule_id} timed out while computing it",
+                    )
+                except StageAbandoned as exc:
+                    outcome = ("TIMEOUT", f"Not run: {exc}.")
+                duration = time.perf_counter() - t0
 
-        elif r_type == "extra_ids":
-            if len(ids_laweb_only) == 0:
-                result = "PASS"
-                details = "No extra IDs in LAWEB."
-            else:
-                result = "FAIL"
-                details = f"{len(ids_laweb_only)} IDs present in LAWEB but missing in SF."
+                if outcome is None:
+                    result, details = "TIMEOUT", f"Rule exceeded its time budget of {budget:.3g}s."
+                else:
+                    result, details = outcome
 
-        elif r_type == "column_count":
-            if sf_cols == lw_cols:
-                result = "PASS"
-                details = f"Column counts match (SF={sf_cols}, LAWEB={lw_cols})."
-            else:
-                result = "FAIL"
-                details = f"Column counts differ (SF={sf_cols}, LAWEB={lw_cols})."
+                # Exponentially weighted cost history for cost ordering. A
+                # TIMEOUT only tells us the rule costs at least its budget.
+                previous = table_costs.get(rule_id)
+                if result == "TIMEOUT":
+                    table_costs[rule_id] = max(previous or 0.0, duration)
+                else:
+                    cost = _rule_cost(ctx, usage, duration)
+                    table_costs[rule_id] = cost if previous is None else 0.5 * previous + 0.5 * cost
 
-        elif r_type == "column_names":
-            if not column_missing_sf and not column_missing_laweb:
-                result = "PASS"
-                details = "All column names match."
-            else:
-                result = "FAIL"
-                details = (
-                    f"Missing in SF: {len(column_missing_sf)}, "
-                    f"missing in LAWEB: {len(column_missing_laweb)}."
-                )
+                if (
+                    result == "FAIL"
+                    and policy.get("fail_fast")
+                    and priority.strip().lower() == "critical"
+                ):
+                    stopped_early = f"fail-fast after Critical rule {rule_id} failed."
 
-        elif r_type == "pk_unique":
-            sf_dup = sf[pk].duplicated(keep=False).sum()
-            lw_dup = laweb[pk].duplicated(keep=False).sum()
-            if sf_dup == 0 and lw_dup == 0:
-                result = "PASS"
-                details = "Primary key is unique in both datasets."
-            else:
-                result = "FAIL"
-                details = f"Duplicate PK values - SF={sf_dup}, LAWEB={lw_dup}."
-
-        elif r_type == "pk_not_null":
-            sf_null = sf[pk].isna().sum()
-            lw_null = laweb[pk].isna().sum()
-            if sf_null == 0 and lw_null == 0:
-                result = "PASS"
-                details = "Primary key has no NULL values in both datasets."
-            else:
-                result = "FAIL"
-                details = f"NULL PK values - SF={sf_null}, LAWEB={lw_null}."
+        outcomes[rule_id] = {"result": result, "details": details, "duration_s": round(duration, 4)}
 
-        elif r_type == "sample_row_compare":
-            if row_diff is None or row_diff.empty:
-                result = "PASS"
-                details = "No row-level mismatches detected in sample."
-            else:
-                result = "FAIL"
-                details = f"{len(row_diff)} row-level mismatches detected (sample, max 100 shown)."
-
-        elif r_type == "full_row_compare":
-            if full_mismatch_count is None:
-                full_mismatch_count = _compute_full_row_mismatch_count(sf, laweb, pk, common_cols)
-            if full_mismatch_count == 0:
-                result = "PASS"
-                details = "All matched rows are identical across all common columns."
-            else:
-                result = "FAIL"
-                details = f"{full_mismatch_count} joined rows have at least one differing column value."
-
-        elif r_type == "null_pattern":
-            threshold = float(rule_def.get("threshold", 20.0))
-            if null_pattern_cache is None:
-                null_pattern_cache = _compute_null_pattern_violations(sf, laweb, common_cols, threshold)
-            if not null_pattern_cache:
-                result = "PASS"
-                details = f"NULL pattern consistent within ±{threshold}% for all common columns."
-            else:
-                result = "FAIL"
-                top = null_pattern_cache[:3]
-                sample_str = ", ".join(
-                    f"{v['column']} (SF={v['sf_null_pct']}%, LAWEB={v['laweb_null_pct']}%, Δ={v['diff_pct']}%)"
-                    for v in top
-                )
-                details = (
-                    f"NULL pattern differs by more than {threshold}% in "
-                    f"{len(null_pattern_cache)} columns. Top examples: {sample_str}"
-                )
+    save_rule_costs(costs_path, all_costs)
 
-        else:
-            result = "SKIPPED"
-            details = f"Unknown or not implemented rule type '{r_type}'."
+    # -------------- SCORING (config order) --------------
+    results: List[Dict[str, Any]] = []
+    passed = failed = skipped = timed_out = critical_failed = 0
+    total_weight = 0.0
+    gained_weight = 0.0
+
+    for rule_id, rule_def in selected:
+        name = rule_def.get("name", "")
+        priority = rule_def.get("priority", "Medium")
+        weight = _weight_for_priority(priority)
+        outcome = outcomes[rule_id]
+        result = outcome["result"]
 
-        # -------------- SCORING --------------
         if result == "PASS":
             passed += 1
             total_weight += weight
@@ -304,6 +1020,9 @@ def evaluate_rules(
             total_weight += weight
             if priority.strip().lower() == "critical":
                 critical_failed += 1
+        elif result == "TIMEOUT":
+            timed_out += 1
+            total_weight += weight  # not evaluated in time: counts as not passed
         else:
             skipped += 1
 
@@ -313,7 +1032,8 @@ def evaluate_rules(
                 "name": name,
                 "priority": priority,
                 "result": result,
-                "details": details,
+                "details": outcome["details"],
+                "duration_s": outcome["duration_s"],
             }
         )
 
@@ -324,6 +1044,8 @@ def evaluate_rules(
         "passed": passed,
         "failed": failed,
         "skipped": skipped,
+        "timed_out": timed_out,
         "critical_failed": critical_failed,
+        "stopped_early": stopped_early,
         "rules": results,
     }
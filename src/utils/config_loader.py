@@ -1,9 +1,24 @@
 import yaml
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
 
+from utils.helpers import partition_paths
 
-def load_table_config() -> Dict[str, Any]:
+DEFAULT_TABLE_CONFIG = os.path.join("config", "table_mapping.yaml")
+
+# libyaml's C loader when PyYAML was built with it (several times faster)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def read_yaml(path: str) -> Dict[str, Any]:
+    """
+    Parse a YAML file with safe-load semantics. An empty file gives {}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+def load_table_config(config_path: str = DEFAULT_TABLE_CONFIG) -> Dict[str, Any]:
     """
     Load the entire table_mapping.yaml and return the 'tables' section.
 
@@ -20,16 +35,47 @@ def load_table_config() -> Dict[str, Any]:
         laweb: "data/raw/StoricoReferenteEntita_LAWEB.csv"
         primary_key: "ID"
         dtype_map: null
-    """
-    config_path = os.path.join("config", "table_mapping.yaml")
 
+    primary_key may also be a list of columns for composite keys, e.g.
+    ["INFOENTITA_ID", "RUOLOREFERENTEENTITA_ID"].
+    """
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"YAML configuration not found: {config_path}")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = read_yaml(config_path)
 
     if "tables" not in data:
         raise ValueError("YAML file must contain a top-level 'tables:' section.")
 
     return data["tables"]
+
+
+def validate_table_config(tables: Dict[str, Any], rule_ids: Iterable[str]) -> List[str]:
+    """
+    Check the table mapping without loading any data: every table names its
+    SF / LAWEB files and primary key, the referenced files (CSVs and the
+    optional dtype map) exist, and rules_enabled only lists known rule IDs.
+    Returns a list of problems (empty when valid).
+    """
+    known_rules = set(rule_ids)
+    problems = []
+
+    for table, entry in tables.items():
+        if not isinstance(entry, dict):
+            problems.append(f"Table {table}: entry must be a mapping.")
+            continue
+
+        for key in ("sf", "laweb", "primary_key"):
+            if not entry.get(key):
+                problems.append(f"Table {table}: missing '{key}'.")
+
+        for key in ("sf", "laweb", "dtype_map"):
+            for path in partition_paths(entry.get(key)):
+                if path and not os.path.exists(path):
+                    problems.append(f"Table {table}: {key} file not found: {path}")
+
+        unknown = [r for r in entry.get("rules_enabled") or [] if r not in known_rules]
+        if unknown:
+            problems.append(f"Table {table}: unknown rule(s) in rules_enabled: {', '.join(map(str, unknown))}")
+
+    return problems
@@ -1,15 +1,39 @@
 import pandas as pd
 
+from utils.helpers import partition_paths
 
-def load_csv_case_insensitive(path: str) -> pd.DataFrame:
-    """
-    Load a CSV file and normalize column names to UPPERCASE (case-insensitive matching).
-    We let pandas infer dtypes so dtype comparison still works.
-    """
+
+def _read_csv(path: str) -> pd.DataFrame:
     try:
         df = pd.read_csv(path)
     except UnicodeDecodeError:
         df = pd.read_csv(path, encoding="latin1")
-
     df.columns = [c.strip().upper() for c in df.columns]
     return df
+
+
+def load_csv_case_insensitive(path) -> pd.DataFrame:
+    """
+    Load a CSV file and normalize column names to UPPERCASE (case-insensitive matching).
+    We let pandas infer dtypes so dtype comparison still works.
+    `path` may also be a list of partition files, concatenated in order;
+    their headers are normalized one by one and must name the same columns
+    (ValueError otherwise). The row count of every partition is kept in
+    attrs["partition_rows"].
+    """
+    paths = partition_paths(path)
+    frames = [_read_csv(p) for p in paths]
+    if len(frames) == 1:
+        return frames[0]
+
+    expected = set(frames[0].columns)
+    for p, frame in zip(paths[1:], frames[1:]):
+        if set(frame.columns) != expected:
+            missing = sorted(expected - set(frame.columns))
+            extra = sorted(set(frame.columns) - expected)
+            raise ValueError(
+                f"Partition {p} does not match {paths[0]}: missing columns {missing}, extra columns {extra}."
+            )
+    df = pd.concat(frames, ignore_index=True)
+    df.attrs["partition_rows"] = [len(f) for f in frames]
+    return df
@@ -1,3 +1,7 @@
+import sys
+import time
+
+
 def safe_len(obj) -> int:
     """Return len(obj) but handle None as 0."""
     if obj is None:
@@ -6,3 +10,56 @@ def safe_len(obj) -> int:
         return len(obj)
     except TypeError:
         return 0
+
+
+def partition_paths(path) -> list:
+    """
+    A table extract as a list of files: table_mapping.yaml `sf` / `laweb`
+    may be one CSV path or a list of partition files of the same table.
+    """
+    if path is None:
+        return []
+    return [path] if isinstance(path, str) else list(path)
+
+
+class StageTimer:
+    """
+    Lap timer for pipeline stages: each lap(name) records the seconds
+    elapsed since the previous lap (or since the timer was created).
+    """
+
+    def __init__(self):
+        self._clock = time.perf_counter
+        self._start = self._last = self._clock()
+        self.timings = {}
+
+    def lap(self, stage: str) -> float:
+        now = self._clock()
+        elapsed = now - self._last
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        return self._clock() - self._start
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory in MB of the largest single process, or None if
+    unavailable: the larger of this process's peak and that of its largest
+    (terminated) child, e.g. a --workers process. Not the total across
+    processes: RUSAGE_CHILDREN reports the largest child, not a sum.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
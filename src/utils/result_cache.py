@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join("reports", "cache")
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # treat a corrupt entry as a miss
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def file_digest(path: Optional[str], cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[str]:
+    """
+    SHA-256 of a file's content, or None if there is no such file.
+
+    Digests are memoized in <cache_dir>/file_digests.json keyed by
+    (path, size, mtime), so an unchanged multi-GB extract is only hashed
+    once rather than on every scheduler cycle.
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    st = os.stat(path)
+    memo_path = os.path.join(cache_dir, "file_digests.json")
+    memo = _read_json(memo_path) or {}
+    abs_path = os.path.abspath(path)
+
+    entry = memo.get(abs_path)
+    if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return entry["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    memo[abs_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    _write_json(memo_path, memo)
+    return digest
+
+
+def code_digest(root: str, suffixes=(".py", ".j2")) -> str:
+    """
+    SHA-256 over the source files under root (relative path + content), so
+    a cached report is never served after the code producing it changed,
+    even if __version__ was not bumped.
+    """
+    h = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for name in sorted(filenames):
+            if not name.endswith(suffixes):
+                continue
+            path = os.path.join(dirpath, name)
+            h.update(os.path.relpath(path, root).replace(os.sep, "/").encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                h.update(f.read())
+            h.update(b"\0")
+    return h.hexdigest()
+
+
+def compute_cache_key(inputs: Dict[str, Any]) -> str:
+    """
+    Stable content-addressed key for a comparison run.
+    `inputs` must be JSON-serializable (file digests, rule config, version, ...).
+    """
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_result(
+    table_name: str,
+    cache_key: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached entry {"summary": ..., "report_path": ...} for this key,
+    or None on a miss: no entry, or the HTML report was since removed or
+    overwritten by a run with different inputs.
+    """
+    entry = _read_json(os.path.join(cache_dir, table_name, f"{cache_key}.json"))
+    if entry is None:
+        return None
+
+    report_path = entry.get("report_path", "")
+    if not os.path.exists(report_path):
+        return None
+    st = os.stat(report_path)
+    if st.st_size != entry.get("report_size") or st.st_mtime_ns != entry.get("report_mtime_ns"):
+        return None
+    return entry
+
+
+def store_result(
+    table_name: str,
+    cache_key: str,
+    summary: Dict[str, Any],
+    report_path: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> None:
+    """
+    Persist the evaluate_rules summary and report location for this key.
+    """
+    st = os.stat(report_path)
+    _write_json(
+        os.path.join(cache_dir, table_name, f"{cache_key}.json"),
+        {
+            "summary": summary,
+            "report_path": report_path,
+            "report_size": st.st_size,
+            "report_mtime_ns": st.st_mtime_ns,
+        },
+    )
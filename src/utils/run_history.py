@@ -0,0 +1,229 @@
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.config_loader import read_yaml
+
+DEFAULT_HISTORY_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "path": os.path.join("reports", "history", "run_history.sqlite"),
+    "regression_threshold_pct": 25.0,  # runtime / memory above baseline by more than this
+    "baseline_window": 5,              # previous full runs forming the moving baseline
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name         TEXT NOT NULL,
+    started_at         TEXT NOT NULL,
+    tool_version       TEXT,
+    cache_hit          INTEGER NOT NULL DEFAULT 0,
+    score              REAL,
+    passed             INTEGER,
+    failed             INTEGER,
+    skipped            INTEGER,
+    timed_out          INTEGER,
+    critical_failed    INTEGER,
+    sf_rows            INTEGER,
+    laweb_rows         INTEGER,
+    sf_bytes           INTEGER,
+    laweb_bytes        INTEGER,
+    row_mismatch_count INTEGER,
+    total_seconds      REAL,
+    peak_rss_mb        REAL,
+    input_digest       TEXT,
+    workers            INTEGER,
+    backend            TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_table ON runs (table_name, id);
+
+CREATE TABLE IF NOT EXISTS rule_results (
+    run_id     INTEGER NOT NULL REFERENCES runs (id),
+    rule_id    TEXT NOT NULL,
+    name       TEXT,
+    priority   TEXT,
+    result     TEXT,
+    details    TEXT,
+    duration_s REAL
+);
+
+CREATE TABLE IF NOT EXISTS stage_timings (
+    run_id  INTEGER NOT NULL REFERENCES runs (id),
+    stage   TEXT NOT NULL,
+    seconds REAL
+);
+
+CREATE TABLE IF NOT EXISTS column_mismatches (
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    column_name TEXT NOT NULL,
+    mismatches  INTEGER,
+    rate_pct    REAL
+);
+"""
+
+# Columns added to `runs` after its first release: ALTERed into older stores
+_ADDED_RUN_COLUMNS = {"input_digest": "TEXT", "workers": "INTEGER", "backend": "TEXT"}
+
+_RUN_FIELDS = [
+    "table_name", "started_at", "tool_version", "cache_hit", "score", "passed", "failed",
+    "skipped", "timed_out", "critical_failed", "sf_rows", "laweb_rows", "sf_bytes",
+    "laweb_bytes", "row_mismatch_count", "total_seconds", "peak_rss_mb",
+    "input_digest", "workers", "backend",
+]
+
+
+def load_history_settings(path: str = "config/data_quality_rules.yaml") -> Dict[str, Any]:
+    """
+    DEFAULT_HISTORY_SETTINGS updated with the optional top-level `history:`
+    section of the rules YAML.
+    """
+    settings = dict(DEFAULT_HISTORY_SETTINGS)
+    if os.path.exists(path):
+        data = read_yaml(path)
+        settings.update(data.get("history") or {})
+    return settings
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    existing = {r["name"] for r in conn.execute("PRAGMA table_info(runs)")}
+    for column, sql_type in _ADDED_RUN_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE runs ADD COLUMN {column} {sql_type}")
+    return conn
+
+
+def record_run(
+    db_path: str,
+    run: Dict[str, Any],
+    rules: List[Dict[str, Any]],
+    stage_timings: Optional[Dict[str, float]] = None,
+    column_stats: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """
+    Append one run with its per-rule results, stage timings and per-column
+    mismatch counts. `run` holds the runs-table fields (missing ones are
+    stored as NULL). Returns the new run id.
+    """
+    conn = _connect(db_path)
+    try:
+        with conn:
+            cur = conn.execute(
+                f"INSERT INTO runs ({', '.join(_RUN_FIELDS)}) "
+                f"VALUES ({', '.join('?' for _ in _RUN_FIELDS)})",
+                [run.get(f) for f in _RUN_FIELDS],
+            )
+            run_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO rule_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, r["id"], r.get("name"), r.get("priority"), r.get("result"),
+                     r.get("details"), r.get("duration_s"))
+                    for r in rules
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO stage_timings VALUES (?, ?, ?)",
+                [(run_id, stage, secs) for stage, secs in (stage_timings or {}).items()],
+            )
+            conn.executemany(
+                "INSERT INTO column_mismatches VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, c["column"], c["mismatches"], c["rate_pct"])
+                    for c in (column_stats or [])
+                    if c["mismatches"]
+                ],
+            )
+        return run_id
+    finally:
+        conn.close()
+
+
+def load_runs(db_path: str, table_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    All recorded runs (oldest first), optionally for one table, each with
+    its stage timings under "stages".
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    conn = _connect(db_path)
+    try:
+        if table_name is None:
+            rows = conn.execute("SELECT * FROM runs ORDER BY id").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM runs WHERE table_name = ? ORDER BY id", (table_name,)
+            ).fetchall()
+        runs = [dict(r) for r in rows]
+
+        stages: Dict[int, Dict[str, float]] = {}
+        for r in conn.execute("SELECT run_id, stage, seconds FROM stage_timings"):
+            stages.setdefault(r["run_id"], {})[r["stage"]] = r["seconds"]
+        for run in runs:
+            run["stages"] = stages.get(run["id"], {})
+        return runs
+    finally:
+        conn.close()
+
+
+def _baseline_key(run: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Runs are only compared with runs on the same input (by content digest,
+    or by file sizes for runs recorded before digests were) and the same
+    --workers / --backend.
+    """
+    inputs = run.get("input_digest") or (run.get("sf_bytes"), run.get("laweb_bytes"))
+    return run["table_name"], inputs, run.get("workers"), run.get("backend")
+
+
+def find_regressions(
+    runs: List[Dict[str, Any]],
+    threshold_pct: float = 25.0,
+    window: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Flag full (non-cached) runs whose runtime or peak memory exceeds the
+    moving baseline, the mean of the previous `window` comparable full runs
+    (same table, input and worker settings, see _baseline_key), by more
+    than threshold_pct. A run on a new extract or with other workers starts
+    a new baseline instead of being flagged.
+
+    Returns a list of {run_id, table_name, started_at, metric, value,
+    baseline, increase_pct}.
+    """
+    flagged = []
+    by_key: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for run in runs:
+        if not run.get("cache_hit"):
+            by_key.setdefault(_baseline_key(run), []).append(run)
+
+    for comparable in by_key.values():
+        for i, run in enumerate(comparable):
+            previous = comparable[max(0, i - window):i]
+            if not previous:
+                continue
+            for metric in ("total_seconds", "peak_rss_mb"):
+                values = [r[metric] for r in previous if r.get(metric) is not None]
+                if not values or run.get(metric) is None:
+                    continue
+                baseline = sum(values) / len(values)
+                if baseline <= 0:
+                    continue
+                increase_pct = 100.0 * (run[metric] - baseline) / baseline
+                if increase_pct > threshold_pct:
+                    flagged.append(
+                        {
+                            "run_id": run["id"],
+                            "table_name": run["table_name"],
+                            "started_at": run["started_at"],
+                            "metric": metric,
+                            "value": run[metric],
+                            "baseline": baseline,
+                            "increase_pct": increase_pct,
+                        }
+                    )
+    return flagged
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The CLI runs as `python3 src/main.py`, so modules import each other
+# relative to src/ (e.g. `from compare.row_comparison import ...`).
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
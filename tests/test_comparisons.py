@@ -1,3 +1,207 @@
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from compare.alignment import align_rows
+from compare.column_comparison import compare_columns
+from compare.column_diff import DiffCancelled, _cooccurrence, compute_column_diffs
+from compare.id_comparison import compare_ids
+from compare.keys import encode_keys
+from compare.row_comparison import compare_rows
+from rules.engine import _compute_column_rate_violations, _compute_full_row_mismatch_count
+from utils.file_loader import load_csv_case_insensitive
+
+
 def test_dummy():
     assert 1 == 1
 
+
+def _dup_heavy_frames(n_dups=2000):
+    sf = pd.DataFrame(
+        {
+            "ID": [0] * n_dups + [1, 2, 3],
+            "NAME": ["x"] * n_dups + ["a", "b", "c"],
+        }
+    )
+    laweb = pd.DataFrame(
+        {
+            "ID": [0] * n_dups + [1, 2, None],
+            "NAME": ["y"] * n_dups + ["a", "B", "c"],
+        }
+    )
+    return sf, laweb
+
+
+def test_align_rows_quarantines_duplicate_and_null_keys():
+    sf, laweb = _dup_heavy_frames()
+    aligned = align_rows(sf, laweb, "id")
+
+    # Bounded by the inputs, not by n_dups * n_dups
+    assert len(aligned["sf"]) == 2
+    assert aligned["sf"]["ID"].tolist() == aligned["laweb"]["ID"].tolist() == [1, 2]
+    assert aligned["sf_duplicates"].to_dict("records") == [{"ID": 0, "COUNT": 2000}]
+    assert aligned["sf_quarantined"] == 2000
+    assert aligned["laweb_quarantined"] == 2001
+
+
+def test_row_diff_ignores_quarantined_keys():
+    sf, laweb = _dup_heavy_frames()
+    diff = compare_rows(sf, laweb, "ID", ["ID", "NAME"])
+    assert diff.to_dict("records") == [
+        {"PK": 2, "COLUMN": "NAME", "value_sf": "b", "value_laweb": "B"}
+    ]
+    assert _compute_full_row_mismatch_count(sf, laweb, "ID", ["ID", "NAME"]) == 1
+
+
+def _composite_frames():
+    sf = pd.DataFrame(
+        {
+            "A": [1, 1, 2, 2, None],
+            "B": ["x", "y", "x", "y", "x"],
+            "VAL": [10, 11, 12, 13, 14],
+        }
+    )
+    laweb = pd.DataFrame(
+        {
+            "A": [1, 1, 2, 3],
+            "B": ["x", "y", "y", "x"],
+            "VAL": [10, 99, 13, 15],
+        }
+    )
+    return sf, laweb
+
+
+def test_encode_keys_consistent_across_sides():
+    sf, laweb = _composite_frames()
+    codes = encode_keys(sf, laweb, "a, b")
+    assert codes["sf"].dtype == np.int64
+    assert codes["sf"][4] == -1
+    assert codes["sf"][0] == codes["laweb"][0]
+    assert codes["sf"][3] == codes["laweb"][2]
+    assert len(set(codes["sf"][:4])) == 4
+
+
+def test_composite_key_ids_and_rows():
+    sf, laweb = _composite_frames()
+    sf_only, lw_only = compare_ids(sf, laweb, ["A", "B"])
+    assert sf_only == [(2.0, "x")]
+    assert lw_only == [(3.0, "x")]
+
+    diff = compare_rows(sf, laweb, "A,B", ["A", "B", "VAL"])
+    assert diff.to_dict("records") == [
+        {"PK": (1.0, "y"), "COLUMN": "VAL", "value_sf": "11", "value_laweb": "99"}
+    ]
+
+
+def test_sharded_column_diff_matches_serial():
+    sf = load_csv_case_insensitive("data/raw/guarantee_sf.csv")
+    laweb = load_csv_case_insensitive("data/raw/guarantee_laweb.csv")
+    common_cols, _, _ = compare_columns(sf, laweb)
+    aligned = align_rows(sf, laweb, "ID")
+
+    serial = compute_column_diffs(aligned, "ID", common_cols, workers=1)
+    sharded = compute_column_diffs(aligned, "ID", common_cols, workers=2)
+
+    assert sharded["row_mismatch_count"] == serial["row_mismatch_count"]
+    assert serial["row_mismatch_count"] == _compute_full_row_mismatch_count(
+        sf, laweb, "ID", common_cols, aligned=aligned
+    )
+    assert [(s["column"], s["mismatches"], s["top_pairs"]) for s in sharded["columns"]] == [
+        (s["column"], s["mismatches"], s["top_pairs"]) for s in serial["columns"]
+    ]
+    assert sharded["cooccurrence"]["columns"] == serial["cooccurrence"]["columns"]
+    np.testing.assert_array_equal(sharded["cooccurrence"]["matrix"], serial["cooccurrence"]["matrix"])
+
+    expected = compare_rows(sf, laweb, "ID", common_cols, aligned=aligned)
+    actual = compare_rows(sf, laweb, "ID", common_cols, aligned=aligned, column_diffs=sharded)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_cancelled_column_diff_stops_its_workers():
+    sf = load_csv_case_insensitive("data/raw/guarantee_sf.csv")
+    laweb = load_csv_case_insensitive("data/raw/guarantee_laweb.csv")
+    common_cols, _, _ = compare_columns(sf, laweb)
+    aligned = align_rows(sf, laweb, "ID")
+    cancel = threading.Event()
+    cancel.set()
+
+    for workers in (1, 2):
+        with pytest.raises(DiffCancelled):
+            compute_column_diffs(aligned, "ID", common_cols, workers=workers, cancel=cancel)
+
+    deadline = time.monotonic() + 5
+    while multiprocessing.active_children() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not multiprocessing.active_children()
+
+
+def test_column_mismatch_matrix():
+    sf = pd.DataFrame({"ID": [1, 2, 3, 4], "A": ["x", "x", "x", "y"], "B": [1, 2, 3, None], "C": [0, 0, 0, 0]})
+    laweb = pd.DataFrame({"ID": [1, 2, 3, 4], "A": ["z", "z", "x", "y"], "B": [9, 2, 3, 5], "C": [0, 0, 0, 0]})
+    aligned = align_rows(sf, laweb, "ID")
+    diffs = compute_column_diffs(aligned, "ID", ["A", "B", "C", "ID"], top_k=1)
+
+    by_col = {s["column"]: s for s in diffs["columns"]}
+    assert [s["column"] for s in diffs["columns"]] == ["A", "B", "C"]
+    assert by_col["A"]["mismatches"] == 2 and by_col["A"]["rate_pct"] == 50.0
+    assert by_col["A"]["top_pairs"] == [{"value_sf": "x", "value_laweb": "z", "count": 2}]
+    assert by_col["C"]["mismatches"] == 0 and by_col["C"]["top_pairs"] == []
+    assert diffs["row_mismatch_count"] == 3
+
+    assert diffs["cooccurrence"]["columns"] == ["A", "B"]
+    assert diffs["cooccurrence"]["matrix"].tolist() == [[2, 1], [1, 2]]
+
+    assert [v["column"] for v in _compute_column_rate_violations(diffs, 10.0)] == ["A", "B"]
+    assert _compute_column_rate_violations(diffs, 10.0, columns=["c"]) == []
+    assert _compute_column_rate_violations(diffs, 50.0) == []
+
+
+def test_cooccurrence_accumulates_over_row_chunks():
+    rng = np.random.default_rng(0)
+    masks = {c: rng.random(1000) < 0.1 for c in "ABC"}
+    dense = np.column_stack([masks[c] for c in "ABC"]).astype(np.int64)
+
+    columns, co, any_mask = _cooccurrence(masks, ["A", "B", "C", "D"], 1000, chunk_rows=64)
+    assert columns == ["A", "B", "C"]
+    assert co.tolist() == (dense.T @ dense).tolist()
+    assert np.array_equal(any_mask, dense.any(axis=1))
+
+
+def test_partitioned_extract_loads_as_one_table(tmp_path):
+    part1, part2 = tmp_path / "p1.csv", tmp_path / "p2.csv"
+    part1.write_text("id,name\n1,a\n2,b\n")
+    part2.write_text("id,name\n3,c\n")
+
+    df = load_csv_case_insensitive([str(part1), str(part2)])
+    assert list(df.columns) == ["ID", "NAME"]
+    assert df["ID"].tolist() == [1, 2, 3]
+
+
+def test_partition_headers_are_normalized_before_concat(tmp_path):
+    part1, part2, part3 = tmp_path / "p1.csv", tmp_path / "p2.csv", tmp_path / "p3.csv"
+    part1.write_text("id,Name\n1,a\n")
+    part2.write_text(" ID ,NAME\n2,b\n")
+    part3.write_text("id,code\n3,c\n")
+
+    df = load_csv_case_insensitive([str(part1), str(part2)])
+    assert list(df.columns) == ["ID", "NAME"]
+    assert df["NAME"].tolist() == ["a", "b"]
+
+    with pytest.raises(ValueError, match="p3.csv"):
+        load_csv_case_insensitive([str(part1), str(part3)])
+
+
+def test_top_value_pairs_counts_codes_and_shows_nulls():
+    sf = pd.DataFrame({"ID": range(6), "A": ["a", "a", "b", None, "b", "c"]})
+    laweb = pd.DataFrame({"ID": range(6), "A": ["x", "x", "y", "z", "y", "c"]})
+    diffs = compute_column_diffs(align_rows(sf, laweb, "ID"), "ID", ["A"], top_k=3)
+
+    assert diffs["columns"][0]["top_pairs"] == [
+        {"value_sf": "a", "value_laweb": "x", "count": 2},
+        {"value_sf": "b", "value_laweb": "y", "count": 2},
+        {"value_sf": "__NA__", "value_laweb": "z", "count": 1},
+    ]
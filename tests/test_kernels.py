@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compare.alignment import align_rows
+from compare.column_comparison import compare_columns
+from compare.column_diff import compute_column_diffs
+from compare.id_comparison import compare_ids
+from compare.kernels import get_kernels
+from compare.keys import encode_keys
+from compare.row_comparison import compare_rows
+from rules.engine import _compute_full_row_mismatch_count, _compute_null_pattern_violations
+from utils.file_loader import load_csv_case_insensitive
+
+pytest.importorskip("pyarrow")
+
+
+def _diff_summary(diffs):
+    return (
+        diffs["row_mismatch_count"],
+        [(s["column"], s["mismatches"], s["positions"].tolist(), s["top_pairs"]) for s in diffs["columns"]],
+        diffs["cooccurrence"]["columns"],
+        diffs["cooccurrence"]["matrix"].tolist(),
+    )
+
+
+@pytest.mark.parametrize(
+    "sf_path, laweb_path",
+    [
+        ("data/raw/guarantee_sf.csv", "data/raw/guarantee_laweb.csv"),
+        ("data/raw/StoricoReferenteEntita_SF.csv", "data/raw/StoricoReferenteEntita_LAWEB.csv"),
+    ],
+)
+def test_arrow_backend_matches_pandas_on_sample_tables(sf_path, laweb_path):
+    sf = load_csv_case_insensitive(sf_path)
+    laweb = load_csv_case_insensitive(laweb_path)
+    common_cols, _, _ = compare_columns(sf, laweb)
+
+    pd_codes = encode_keys(sf, laweb, "ID", backend="pandas")
+    pa_codes = encode_keys(sf, laweb, "ID", backend="arrow")
+    # Codes may be numbered differently; the partition of rows must match
+    pd_all = np.concatenate([pd_codes["sf"], pd_codes["laweb"]])
+    pa_all = np.concatenate([pa_codes["sf"], pa_codes["laweb"]])
+    assert ((pd_all < 0) == (pa_all < 0)).all()
+    assert pd.factorize(pd_all)[0].tolist() == pd.factorize(pa_all)[0].tolist()
+    assert compare_ids(sf, laweb, "ID", key_codes=pa_codes) == compare_ids(sf, laweb, "ID", key_codes=pd_codes)
+
+    aligned = align_rows(sf, laweb, "ID")
+    pd_diffs = compute_column_diffs(aligned, "ID", common_cols, backend="pandas")
+    pa_diffs = compute_column_diffs(aligned, "ID", common_cols, backend="arrow")
+    pa_sharded = compute_column_diffs(aligned, "ID", common_cols, workers=2, backend="arrow")
+    assert _diff_summary(pa_diffs) == _diff_summary(pd_diffs)
+    assert _diff_summary(pa_sharded) == _diff_summary(pd_diffs)
+
+    assert _compute_full_row_mismatch_count(
+        sf, laweb, "ID", common_cols, aligned=aligned, backend="arrow"
+    ) == pd_diffs["row_mismatch_count"]
+    assert _compute_null_pattern_violations(sf, laweb, common_cols, 5.0, backend="arrow") == (
+        _compute_null_pattern_violations(sf, laweb, common_cols, 5.0, backend="pandas")
+    )
+    pd.testing.assert_frame_equal(
+        compare_rows(sf, laweb, "ID", common_cols, aligned=aligned, backend="arrow"),
+        compare_rows(sf, laweb, "ID", common_cols, aligned=aligned, backend="pandas"),
+    )
+
+
+def test_arrow_kernels_null_and_type_semantics():
+    arrow = get_kernels("arrow")
+    pandas_ = get_kernels("pandas")
+
+    cases = [
+        (pd.Series([1.0, np.nan, 3.0, np.nan]), pd.Series([1, 2, 4, None])),
+        (pd.Series(["a", None, "c"]), pd.Series(["a", None, "x"])),
+        (pd.Series(["1", "2"]), pd.Series([1, 2])),  # unrelated types never match
+        (pd.Series([None, None]), pd.Series(["a", None])),
+        (pd.Series([1, "a", None], dtype=object), pd.Series([1, "b", None], dtype=object)),  # mixed → fallback
+        (pd.Series(["__NA__", None]), pd.Series([None, None])),  # no sentinel: the literal is a value
+        (pd.Series([1, None, 3, None], dtype="Int64"), pd.Series([1, 2, None, None], dtype="Int64")),
+    ]
+    for a, b in cases:
+        assert arrow.mismatch_mask(a, b).tolist() == pandas_.mismatch_mask(a, b).tolist()
+        assert arrow.null_mask(a).tolist() == pandas_.null_mask(a).tolist()
+
+    codes_a, codes_b, n = arrow.factorize_pair(pd.Series(["1", "2", None]), pd.Series([1, 2, 2]))
+    assert codes_a.tolist() == [0, 1, -1] and codes_b.tolist() == [2, 3, 3] and n == 4
+
+
+def test_row_sample_uses_kernel_null_semantics():
+    sf = pd.DataFrame({"ID": [1, 2, 3, 4], "A": ["__NA__", None, "x", None]})
+    laweb = pd.DataFrame({"ID": [1, 2, 3, 4], "A": [None, None, "x", "y"]})
+    aligned = align_rows(sf, laweb, "ID")
+    for backend in ("pandas", "arrow"):
+        serial = compare_rows(sf, laweb, "ID", ["ID", "A"], aligned=aligned, backend=backend)
+        diffs = compute_column_diffs(aligned, "ID", ["ID", "A"], backend=backend)
+        assert serial["PK"].tolist() == [1, 4]
+        pd.testing.assert_frame_equal(
+            serial, compare_rows(sf, laweb, "ID", ["ID", "A"], aligned=aligned, column_diffs=diffs)
+        )
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_kernels("polars")
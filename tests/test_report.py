@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from compare.generate_html import create_html_report, frame_table
+
+SUMMARY = {
+    "score": 50.0,
+    "passed": 1,
+    "failed": 1,
+    "skipped": 0,
+    "timed_out": 0,
+    "critical_failed": 0,
+    "stopped_early": None,
+    "rules": [
+        {"id": "V01", "name": "Record Count Match", "priority": "Critical", "result": "PASS", "details": "ok"},
+        {"id": "CM02", "name": "Full Row Match", "priority": "High", "result": "FAIL", "details": "<script>x</script>"},
+    ],
+}
+
+
+def test_report_escapes_values_and_streams_row_tables(tmp_path):
+    consumed = []
+
+    def rows():
+        for i in range(3):
+            consumed.append(i)
+            yield (i, "NAME", f"<b>{i}</b>", "a & b")
+
+    column_diffs = {
+        "rows": 3,
+        "row_mismatch_count": 3,
+        "columns": [
+            {"column": "NAME", "mismatches": 3, "rate_pct": 100.0, "positions": np.arange(3),
+             "top_pairs": [{"value_sf": "<i>", "value_laweb": "x", "count": 3}]},
+        ],
+        "cooccurrence": {"columns": ["NAME"], "matrix": np.array([[3]])},
+    }
+
+    path = create_html_report(
+        "T<1>",
+        SUMMARY,
+        missing_in_laweb=["EXTRA"],
+        dtype_diff=frame_table(pd.DataFrame({"COLUMN": ["A"], "REASON": ["int <> str"]})),
+        ids_sf_only=[(1, "x")],
+        column_diffs=column_diffs,
+        row_diff={"columns": ["PK", "COLUMN", "value_sf", "value_laweb"], "rows": rows()},
+        output_folder=str(tmp_path),
+    )
+
+    page = open(path, encoding="utf-8").read()
+    assert consumed == [0, 1, 2]
+    assert "<script>x</script>" not in page and "&lt;script&gt;x&lt;/script&gt;" in page
+    assert "&lt;b&gt;2&lt;/b&gt;" in page and "a &amp; b" in page
+    assert "T&lt;1&gt; – Data Quality Dashboard" in page
+    assert "int &lt;&gt; str" in page and "&lt;i&gt;" in page
+    assert "<td class=\"rule-fail\">FAIL</td>" in page
+    assert "No columns missing in SF." in page and "EXTRA" in page
+    assert "(1, &#39;x&#39;)" in page
+
+
+def test_report_marks_skipped_stages(tmp_path):
+    path = create_html_report(
+        "T", dict(SUMMARY, stopped_early="fail-fast after V01"), not_computed="fail-fast after V01",
+        output_folder=str(tmp_path),
+    )
+    page = open(path, encoding="utf-8").read()
+    assert page.count("Not computed: fail-fast after V01") == 2
+    assert frame_table(pd.DataFrame()) is None
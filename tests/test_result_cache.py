@@ -0,0 +1,54 @@
+import os
+
+from utils.result_cache import code_digest, compute_cache_key, file_digest, load_cached_result, store_result
+
+
+def test_cache_roundtrip_and_invalidation(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data = tmp_path / "sf.csv"
+    data.write_text("ID,NAME\n1,a\n")
+
+    digest = file_digest(str(data), cache_dir=cache_dir)
+    assert digest == file_digest(str(data), cache_dir=cache_dir)
+    assert file_digest(None, cache_dir=cache_dir) is None
+
+    key = compute_cache_key({"sf": digest, "rules": {"V01": {"tolerance": 0}}})
+    assert key == compute_cache_key({"rules": {"V01": {"tolerance": 0}}, "sf": digest})
+    assert key != compute_cache_key({"sf": digest, "rules": {"V01": {"tolerance": 1}}})
+
+    report = tmp_path / "report.html"
+    report.write_text("<html></html>")
+    summary = {"score": 100.0, "rules": []}
+
+    assert load_cached_result("T", key, cache_dir=cache_dir) is None
+    store_result("T", key, summary, str(report), cache_dir=cache_dir)
+    assert load_cached_result("T", key, cache_dir=cache_dir)["summary"] == summary
+
+    # A later run with other inputs overwrote the report → no longer a hit
+    report.write_text("<html>other run</html>")
+    os.utime(report, ns=(1, 1))
+    assert load_cached_result("T", key, cache_dir=cache_dir) is None
+
+
+def test_file_digest_tracks_content_changes(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data = tmp_path / "laweb.csv"
+    data.write_text("ID\n1\n")
+    before = file_digest(str(data), cache_dir=cache_dir)
+
+    data.write_text("ID\n2\n")
+    os.utime(data, ns=(2, 2))
+    assert file_digest(str(data), cache_dir=cache_dir) != before
+
+
+def test_code_digest_tracks_source_changes(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    module = tmp_path / "pkg" / "mod.py"
+    module.write_text("X = 1\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+    before = code_digest(str(tmp_path))
+
+    (tmp_path / "notes.txt").write_text("still ignored")
+    assert code_digest(str(tmp_path)) == before
+    module.write_text("X = 2\n")
+    assert code_digest(str(tmp_path)) != before
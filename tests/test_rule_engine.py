@@ -0,0 +1,159 @@
+import json
+import time
+
+import pandas as pd
+
+from rules import engine
+from rules.engine import evaluate_rules, load_execution_policy
+
+RULES_YAML = """
+execution:
+  fail_fast: false
+rules:
+  V01:
+    name: "Record Count Match"
+    type: "row_count"
+    priority: "Critical"
+    tolerance: 0
+  P02:
+    name: "Primary Key Not NULL"
+    type: "pk_not_null"
+    priority: "Critical"
+  CM02:
+    name: "Full Row Match"
+    type: "full_row_compare"
+    priority: "High"
+"""
+
+
+def _run(tmp_path, policy=None, **kwargs):
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text(RULES_YAML)
+    sf = pd.DataFrame({"ID": [1, 2, 3], "A": ["x", "y", "z"]})
+    laweb = pd.DataFrame({"ID": [1, 2], "A": ["x", "Y"]})
+    return evaluate_rules(
+        sf=sf,
+        laweb=laweb,
+        common_cols=["ID", "A"],
+        pk="ID",
+        column_missing_sf=[],
+        column_missing_laweb=[],
+        ids_sf_only=[3],
+        ids_laweb_only=[],
+        row_diff=None,
+        rules_path=str(rules_path),
+        policy=load_execution_policy(str(rules_path), overrides=policy),
+        **kwargs,
+    )
+
+
+def test_default_policy_runs_everything(tmp_path):
+    summary = _run(tmp_path)
+    assert [r["result"] for r in summary["rules"]] == ["FAIL", "PASS", "FAIL"]
+    assert summary["stopped_early"] is None
+
+
+def test_fail_fast_skips_after_critical_failure(tmp_path):
+    stages = {}
+    summary = _run(tmp_path, policy={"fail_fast": True}, stages=stages)
+    assert [r["result"] for r in summary["rules"]] == ["FAIL", "SKIPPED", "SKIPPED"]
+    assert "V01" in summary["stopped_early"]
+    assert "aligned" not in stages  # the row diff never ran
+
+
+def test_cost_order_uses_measured_history(tmp_path):
+    costs_path = tmp_path / "costs.json"
+    costs_path.write_text(json.dumps({"T": {"V01": 5.0, "P02": 0.1, "CM02": 1.0}}))
+    summary = _run(
+        tmp_path,
+        policy={"order": "cost", "fail_fast": True},
+        table_name="T",
+        costs_path=str(costs_path),
+    )
+    # P02 and CM02 are cheaper, so they ran before the failing V01
+    assert [r["result"] for r in summary["rules"]] == ["FAIL", "PASS", "FAIL"]
+    assert set(json.loads(costs_path.read_text())["T"]) == {"V01", "P02", "CM02"}
+
+
+def test_shared_stage_cost_is_charged_to_every_rule_needing_it(tmp_path, monkeypatch):
+    import compare.column_diff
+
+    def slow_column_diffs(*args, **kwargs):
+        time.sleep(0.2)
+        return {"rows": 0, "row_mismatch_count": 0, "columns": [], "cooccurrence": {}}
+
+    def needs_column_diffs(rule_def, ctx):
+        engine._stage_column_diffs(ctx)
+        return "PASS", ""
+
+    monkeypatch.setattr(compare.column_diff, "compute_column_diffs", slow_column_diffs)
+    monkeypatch.setitem(engine.RULE_HANDLERS, "pk_not_null", needs_column_diffs)
+    monkeypatch.setitem(engine.RULE_HANDLERS, "full_row_compare", needs_column_diffs)
+    costs_path = tmp_path / "costs.json"
+    _run(tmp_path, table_name="T", costs_path=str(costs_path))
+
+    costs = json.loads(costs_path.read_text())["T"]
+    assert costs["P02"] >= 0.2 and costs["CM02"] >= 0.2  # not only the rule that computed it
+    assert costs["V01"] < 0.1
+
+
+def test_timeout_does_not_lower_cost_history(tmp_path, monkeypatch):
+    def slow_rule(rule_def, ctx):
+        time.sleep(0.3)
+        return "PASS", ""
+
+    monkeypatch.setitem(engine.RULE_HANDLERS, "pk_not_null", slow_rule)
+    costs_path = tmp_path / "costs.json"
+    costs_path.write_text(json.dumps({"T": {"P02": 10.0}}))
+    _run(tmp_path, policy={"rule_timeout_s": 0.05}, table_name="T", costs_path=str(costs_path))
+    assert json.loads(costs_path.read_text())["T"]["P02"] == 10.0
+
+
+def test_rule_timeout_marks_timeout(tmp_path, monkeypatch):
+    def slow_rule(rule_def, ctx):
+        time.sleep(0.5)
+        return "PASS", ""
+
+    monkeypatch.setitem(engine.RULE_HANDLERS, "pk_not_null", slow_rule)
+    summary = _run(tmp_path, policy={"rule_timeout_s": 0.05})
+    assert [r["result"] for r in summary["rules"]] == ["FAIL", "TIMEOUT", "FAIL"]
+    assert summary["timed_out"] == 1
+
+
+def test_table_timeout_times_out_remaining_rules(tmp_path, monkeypatch):
+    def slow_rule(rule_def, ctx):
+        time.sleep(0.2)
+        return "PASS", ""
+
+    monkeypatch.setitem(engine.RULE_HANDLERS, "row_count", slow_rule)
+    summary = _run(tmp_path, policy={"table_timeout_s": 0.1})
+    assert [r["result"] for r in summary["rules"]] == ["TIMEOUT", "TIMEOUT", "TIMEOUT"]
+    assert summary["score"] == 0.0
+
+
+def test_timed_out_stage_is_abandoned_not_restarted(tmp_path, monkeypatch):
+    import compare.column_diff
+
+    calls = []
+
+    def slow_column_diffs(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.3)
+        return {"rows": 0, "row_mismatch_count": 0, "columns": [], "cooccurrence": {}}
+
+    def needs_column_diffs(rule_def, ctx):
+        engine._stage_column_diffs(ctx)
+        return "PASS", ""
+
+    monkeypatch.setattr(compare.column_diff, "compute_column_diffs", slow_column_diffs)
+    monkeypatch.setitem(engine.RULE_HANDLERS, "pk_not_null", needs_column_diffs)
+    monkeypatch.setitem(engine.RULE_HANDLERS, "full_row_compare", needs_column_diffs)
+    stages = {}
+    summary = _run(tmp_path, policy={"rule_timeout_s": 0.1}, stages=stages)
+    time.sleep(0.4)  # let the abandoned thread finish
+
+    assert [r["result"] for r in summary["rules"]] == ["FAIL", "TIMEOUT", "TIMEOUT"]
+    assert "abandoned" in summary["rules"][2]["details"]
+    assert len(calls) == 1
+    assert stages.get("column_diffs") is None
+    assert stages["abandoned"] == {"column_diffs": "rule P02 timed out while computing it"}
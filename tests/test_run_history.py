@@ -0,0 +1,72 @@
+import sqlite3
+
+from utils.run_history import _ADDED_RUN_COLUMNS, _RUN_FIELDS, find_regressions, load_runs, record_run
+
+
+def _run(table, seconds, cache_hit=0, score=90.0):
+    return {
+        "table_name": table,
+        "started_at": "2026-01-01T00:00:00",
+        "cache_hit": cache_hit,
+        "score": score,
+        "total_seconds": seconds,
+        "peak_rss_mb": 100.0,
+    }
+
+
+def test_record_and_load_runs(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    rules = [{"id": "V01", "name": "Record Count Match", "priority": "Critical", "result": "PASS", "details": ""}]
+    run_id = record_run(
+        db,
+        _run("Guarantee", 1.5),
+        rules,
+        stage_timings={"load": 1.0, "rules": 0.5},
+        column_stats=[{"column": "A", "mismatches": 3, "rate_pct": 0.3}],
+    )
+    record_run(db, _run("Other", 2.0), rules)
+
+    runs = load_runs(db, "Guarantee")
+    assert [r["id"] for r in runs] == [run_id]
+    assert runs[0]["stages"] == {"load": 1.0, "rules": 0.5}
+    assert runs[0]["score"] == 90.0
+    assert len(load_runs(db)) == 2
+    assert load_runs(str(tmp_path / "missing.sqlite")) == []
+
+
+def test_find_regressions_against_moving_baseline(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    for seconds in (1.0, 1.1, 0.9, 0.01, 2.0):
+        record_run(db, _run("T", seconds, cache_hit=int(seconds < 0.1)), [])
+
+    flagged = find_regressions(load_runs(db), threshold_pct=50.0, window=3)
+    # the cache hit is ignored both as a run and as part of the baseline
+    assert [(f["metric"], round(f["baseline"], 3)) for f in flagged] == [("total_seconds", 1.0)]
+    assert find_regressions(load_runs(db), threshold_pct=150.0, window=3) == []
+
+
+def test_regression_baseline_only_uses_comparable_runs(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    for seconds, digest, workers in ((1.0, "a", 4), (1.0, "a", 4), (3.0, "a", 1), (3.0, "b", 4), (1.1, "a", 4)):
+        record_run(db, dict(_run("T", seconds), input_digest=digest, workers=workers, backend="pandas"), [])
+
+    # a serial run and a run on a new extract start their own baseline
+    assert find_regressions(load_runs(db), threshold_pct=50.0) == []
+
+    record_run(db, dict(_run("T", 5.0), input_digest="b", workers=4, backend="pandas"), [])
+    assert [(f["metric"], f["baseline"]) for f in find_regressions(load_runs(db), threshold_pct=50.0)] == [
+        ("total_seconds", 3.0)
+    ]
+
+
+def test_older_history_store_gets_new_run_columns(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    old_fields = [f for f in _RUN_FIELDS if f not in _ADDED_RUN_COLUMNS]
+    conn = sqlite3.connect(db)
+    conn.execute(f"CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, {', '.join(old_fields)})")
+    conn.execute("INSERT INTO runs (table_name, started_at, total_seconds) VALUES ('T', '2025-12-01', 1.0)")
+    conn.commit()
+    conn.close()
+
+    record_run(db, dict(_run("T", 1.0), workers=2), [])
+    assert [r["workers"] for r in load_runs(db)] == [None, 2]
@@ -0,0 +1,46 @@
+from compare.schema_inference import compare_schemas, infer_column_type, infer_schema, sample_csv_rows
+
+
+def test_infer_column_type_semantic_types():
+    assert infer_column_type(["1,481,635", "681,335", "3"])["type"] == "integer"
+    assert infer_column_type(["1,481,635", "3"])["separator"] == ","
+
+    dec = infer_column_type(["10,008.94", "20,000", ""])
+    assert (dec["type"], dec["precision"], dec["nulls"]) == ("decimal", 2, 1)
+
+    ts = infer_column_type(["2017-04-01 21:06:57.350", "2017-04-01"])
+    assert (ts["type"], ts["precision"]) == ("timestamp", 3)
+
+    assert infer_column_type(["06:57.3"])["type"] == "time"
+    assert infer_column_type(["true", "FALSE"])["type"] == "boolean"
+    assert infer_column_type(["IT"] * 10)["type"] == "categorical"
+    assert infer_column_type(["2703_1", "23611_1"])["type"] == "string"
+    assert infer_column_type(["", ""])["type"] == "empty"
+
+
+def test_sampled_schema_compare(tmp_path):
+    sf = tmp_path / "sf.csv"
+    laweb = tmp_path / "laweb.csv"
+    n = 20000
+    sf.write_text(
+        "id,flag,amount,created\n"
+        + "".join(f'"{i:,}",true,{i}.50,2024-01-01 10:00:00.000\n' for i in range(1000, 1000 + n))
+    )
+    laweb.write_text(
+        "ID,FLAG,AMOUNT,CREATED\n"
+        + "".join(f"{i},1,{i}.5,2024-01-01 10:00:00\n" for i in range(1000, 1000 + n))
+    )
+
+    header, rows = sample_csv_rows(str(sf), head_rows=10, n_chunks=4, chunk_bytes=2048)
+    assert header == ["id", "flag", "amount", "created"]
+    assert 10 < len(rows) < n
+    assert all(len(r) == 4 for r in rows)
+
+    sample = dict(head_rows=10, n_chunks=4, chunk_bytes=2048)
+    diffs = compare_schemas(infer_schema(str(sf), **sample), infer_schema(str(laweb), **sample))
+    assert {d["COLUMN"]: d["REASON"] for d in diffs} == {
+        "ID": "Thousands separator mismatch",
+        "FLAG": "Semantic type mismatch",
+        "AMOUNT": "Precision / scale mismatch",
+        "CREATED": "Precision / scale mismatch",
+    }
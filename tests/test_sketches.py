@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compare.sketches import (
+    KLL,
+    CountMin,
+    HyperLogLog,
+    hash_values,
+    load_or_build_sketches,
+    sketch_csv,
+    sketch_dataframe,
+    sketch_files,
+)
+from compare.schema_inference import infer_schema
+from rules.engine import evaluate_rules
+from utils.file_loader import load_csv_case_insensitive
+
+RULES_YAML = """
+rules:
+  SK01:
+    name: "Distinct Count Drift"
+    type: "distinct_count"
+    priority: "Medium"
+    tolerance_pct: 1.0
+    columns: [CODE]
+  SK02:
+    name: "Quantile Drift"
+    type: "quantile"
+    priority: "Medium"
+    quantiles: [0.5, 0.99]
+    tolerance_pct: 1.0
+    columns: [AMOUNT]
+  SK03:
+    name: "Frequent Values Drift"
+    type: "heavy_hitters"
+    priority: "Low"
+    top_k: 3
+    tolerance_pct: 1.0
+    columns: [CODE]
+"""
+
+
+def test_hyperloglog_estimate_and_merge():
+    values = np.random.default_rng(0).integers(0, 50_000, 200_000)
+    whole = HyperLogLog()
+    whole.update(hash_values(values))
+    assert abs(whole.estimate() - len(np.unique(values))) / len(np.unique(values)) < 0.03
+
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(hash_values(values[:70_000]))
+    right.update(hash_values(values[70_000:]))
+    assert np.array_equal(left.merge(right).registers, whole.registers)
+    assert HyperLogLog.from_dict(whole.to_dict()).estimate() == whole.estimate()
+
+    with pytest.raises(ValueError):
+        whole.merge(HyperLogLog(p=10))
+
+
+def test_kll_quantiles_stream_and_merge():
+    values = np.random.default_rng(1).normal(size=300_000)
+    streamed, left, right = KLL(), KLL(), KLL()
+    for i in range(0, len(values), 10_000):
+        streamed.update(values[i:i + 10_000])
+    left.update(values[:100_000])
+    right.update(values[100_000:])
+    merged = left.merge(right)
+
+    for sketch in (streamed, merged, KLL.from_dict(merged.to_dict())):
+        assert sum(len(items) for items in sketch.levels) < 2_000
+        for q in (0.01, 0.5, 0.99):
+            rank = (values <= sketch.quantile(q)).mean()
+            assert abs(rank - q) < 0.02
+        assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+
+
+def test_count_min_heavy_hitters():
+    values = pd.Series(np.random.default_rng(2).zipf(1.5, 100_000).astype(str))
+    counts = values.value_counts()
+    left, right = CountMin(), CountMin()
+    half = counts.sample(frac=1.0, random_state=0)  # unsorted input
+    left.update(list(half.index[::2]), half.to_numpy()[::2])
+    right.update(list(half.index[1::2]), half.to_numpy()[1::2])
+    top = left.merge(right).heavy_hitters(3)
+
+    assert [h["value"] for h in top] == list(counts.index[:3])
+    for h in top:
+        assert h["count"] >= counts[h["value"]]  # count-min never underestimates
+        assert h["count"] - counts[h["value"]] <= 0.01 * len(values)
+
+
+def test_file_sketches_are_persisted_and_merge_across_partitions(tmp_path):
+    df = pd.DataFrame({
+        "id": [str(i) for i in range(1, 401)],
+        "amount": [f"{i * 1000:,}" for i in range(1, 401)],
+        "when": pd.date_range("2024-01-01", periods=400, freq="D").astype(str),
+    })
+    whole_path, part1, part2 = tmp_path / "whole.csv", tmp_path / "p1.csv", tmp_path / "p2.csv"
+    df.to_csv(whole_path, index=False)
+    df.iloc[:150].to_csv(part1, index=False)
+    df.iloc[150:].to_csv(part2, index=False)
+
+    sketch_dir = tmp_path / "sketches"
+    first = load_or_build_sketches(str(whole_path), str(sketch_dir))
+    assert len(list(sketch_dir.iterdir())) == 1
+    again = load_or_build_sketches(str(whole_path), str(sketch_dir))
+    assert again["columns"]["AMOUNT"]["kll"].quantile(0.5) == first["columns"]["AMOUNT"]["kll"].quantile(0.5)
+
+    merged = sketch_files([str(part1), str(part2)], str(sketch_dir))
+    direct = sketch_csv(str(whole_path))
+    assert merged["rows"] == direct["rows"] == 400
+    assert merged["columns"]["AMOUNT"]["kind"] == "numeric"
+    assert merged["columns"]["WHEN"]["kind"] == "datetime"
+    assert merged["columns"]["AMOUNT"]["kll"].max == 400_000
+    assert np.array_equal(merged["columns"]["ID"]["hll"].registers, direct["columns"]["ID"]["hll"].registers)
+
+
+def test_loaded_partitions_are_sketched_in_memory_with_the_given_schema(tmp_path, monkeypatch):
+    import compare.sketches
+
+    df = pd.DataFrame({"id": range(300), "amount": [f"{i * 1000:,}" for i in range(300)]})
+    part1, part2 = tmp_path / "p1.csv", tmp_path / "p2.csv"
+    df.iloc[:100].to_csv(part1, index=False)
+    df.iloc[100:].to_csv(part2, index=False)
+    paths = [str(part1), str(part2)]
+    schema = infer_schema(paths[0])
+    frame = load_csv_case_insensitive(paths)
+    assert frame.attrs["partition_rows"] == [100, 200]
+
+    def no_reread(*args, **kwargs):
+        raise AssertionError("the file was read / sampled again")
+
+    monkeypatch.setattr(compare.sketches, "sketch_csv", no_reread)
+    monkeypatch.setattr(compare.sketches, "infer_column_type", no_reread)
+    sketch_dir = tmp_path / "sketches"
+    merged = sketch_files(paths, str(sketch_dir), schema=schema, frame=frame)
+    assert len(list(sketch_dir.iterdir())) == 2  # persisted per partition
+    assert merged["rows"] == 300
+    assert merged["columns"]["AMOUNT"]["kind"] == "numeric"
+    assert merged["columns"]["AMOUNT"]["kll"].max == 299_000
+
+    again = sketch_files(paths, str(sketch_dir))  # served from the persisted sketches
+    assert np.array_equal(again["columns"]["ID"]["hll"].registers, merged["columns"]["ID"]["hll"].registers)
+
+
+def _run_sketch_rules(tmp_path, sf, laweb):
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text(RULES_YAML)
+    result = evaluate_rules(
+        sf=sf,
+        laweb=laweb,
+        common_cols=["ID", "CODE", "AMOUNT"],
+        pk="ID",
+        column_missing_sf=[],
+        column_missing_laweb=[],
+        ids_sf_only=[],
+        ids_laweb_only=[],
+        row_diff=None,
+        rules_path=str(rules_path),
+    )
+    return {r["id"]: r["result"] for r in result["rules"]}
+
+
+def test_sketch_rules_pass_on_same_distribution_and_flag_drift(tmp_path):
+    n = 5_000
+    sf = pd.DataFrame({
+        "ID": range(n),
+        "CODE": [f"C{i % 500}" for i in range(n)],
+        "AMOUNT": np.arange(n, dtype=float),
+    })
+    shuffled = sf.sample(frac=1.0, random_state=0).reset_index(drop=True)
+    assert _run_sketch_rules(tmp_path, sf, shuffled) == {"SK01": "PASS", "SK02": "PASS", "SK03": "PASS"}
+
+    drifted = sf.copy()
+    drifted["CODE"] = [f"C{i % 450}" if i % 2 else "C0" for i in range(n)]
+    drifted["AMOUNT"] = drifted["AMOUNT"] * 1.1
+    assert _run_sketch_rules(tmp_path, sf, drifted) == {"SK01": "FAIL", "SK02": "FAIL", "SK03": "FAIL"}
+
+
+def test_dataframe_sketch_types_text_columns():
+    df = pd.DataFrame({"N": ["1,000", "2,500", None], "D": ["2024-01-01", "2024-02-01", "2024-03-01"], "S": list("abc")})
+    sketches = sketch_dataframe(df)
+    assert {c: s["kind"] for c, s in sketches["columns"].items()} == {"N": "numeric", "D": "datetime", "S": None}
+    assert sketches["columns"]["N"]["nulls"] == 1
+    assert sketches["columns"]["N"]["kll"].max == 2500.0
+
+
+def test_quantile_rule_skips_text_columns_and_resolves_columns_first(tmp_path):
+    rules_path = tmp_path / "rules.yaml"
+    sf = pd.DataFrame({"ID": range(100), "CODE": [f"C{i}" for i in range(100)], "AMOUNT": np.arange(100.0)})
+    laweb = sf.assign(AMOUNT=[f"A{i}" for i in range(100)])
+
+    def run(columns, stages=None):
+        rules_path.write_text(
+            f"rules:\n  SK02:\n    name: Q\n    type: quantile\n    priority: Medium\n    columns: {columns}\n"
+        )
+        result = evaluate_rules(
+            sf=sf, laweb=laweb, common_cols=["ID", "CODE", "AMOUNT"], pk="ID",
+            column_missing_sf=[], column_missing_laweb=[], ids_sf_only=[], ids_laweb_only=[],
+            row_diff=None, rules_path=str(rules_path), stages=stages,
+        )
+        return result["rules"][0]
+
+    stages = {}
+    assert run("[NOT_THERE]", stages)["result"] == "SKIPPED"
+    assert "sketches" not in stages  # nothing to check, nothing sketched
+
+    assert run("[CODE]")["result"] == "SKIPPED"  # text on both sides: not applicable
+    mixed = run("[CODE, AMOUNT]")
+    assert mixed["result"] == "FAIL"
+    assert "AMOUNT (SF is numeric, LAWEB is text)" in mixed["details"] and "CODE" not in mixed["details"]
+
+
+def test_sketch_keys_match_across_int_float_text_and_dates():
+    ints = pd.DataFrame({"N": [1, 2, 2, 1000], "D": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"])})
+    floats = pd.DataFrame({"N": [1.0, 2.0, 2.0, 1000.0], "D": ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"]})
+    text = pd.DataFrame({"N": ["1", "2", "2.0", "1,000"], "D": ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"]})
+    a, b, c = (sketch_dataframe(df)["columns"] for df in (ints, floats, text))
+
+    for col in ("N", "D"):
+        assert np.array_equal(a[col]["hll"].registers, b[col]["hll"].registers)
+        assert np.array_equal(a[col]["hll"].registers, c[col]["hll"].registers)
+        assert a[col]["cms"].heavy_hitters(1) == b[col]["cms"].heavy_hitters(1) == c[col]["cms"].heavy_hitters(1)
+    assert a["N"]["cms"].heavy_hitters(1) == [{"value": "2", "count": 2}]
+    assert a["D"]["cms"].heavy_hitters(1) == [{"value": "2024-01-02", "count": 2}]
+
+    flags = sketch_dataframe(pd.DataFrame({"B": [True, True, None]}))["columns"]["B"]  # object dtype
+    assert flags["cms"].heavy_hitters(1) == [{"value": "true", "count": 2}]
+
+
+def test_int_and_float_columns_do_not_drift(tmp_path):
+    n = 2_000
+    sf = pd.DataFrame({"ID": range(n), "CODE": [i % 50 for i in range(n)], "AMOUNT": np.arange(n, dtype=float)})
+    laweb = sf.astype({"CODE": float})  # e.g. an integer column read with NULLs elsewhere
+    assert _run_sketch_rules(tmp_path, sf, laweb) == {"SK01": "PASS", "SK02": "PASS", "SK03": "PASS"}
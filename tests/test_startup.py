@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from rules.engine import load_execution_policy, validate_rules_config
+from utils.config_loader import validate_table_config
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+MAIN = os.path.join("src", "main.py")
+
+# Budget for the CLI on top of the bare interpreter start-up
+STARTUP_BUDGET_S = 0.1
+
+
+def _best_wall_time(args, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, capture_output=True, check=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("flag", ["--help", "--validate-config"])
+def test_light_cli_paths_start_fast_without_pandas(flag):
+    imports = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, flag], cwd=ROOT, capture_output=True, text=True
+    ).stderr
+    imported = {line.rsplit("|", 1)[-1].strip() for line in imports.splitlines()}
+    assert not {"pandas", "numpy", "openpyxl", "pyarrow"} & imported
+
+    overhead = _best_wall_time([MAIN, flag]) - _best_wall_time(["-c", "pass"])
+    assert overhead < STARTUP_BUDGET_S, f"{flag} took {overhead * 1000:.0f} ms over interpreter start-up"
+
+
+def test_validate_rules_config(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(
+        "execution:\n"
+        "  order: cost\n"
+        "rules:\n"
+        "  V01: {name: Rows, type: row_count, priority: Critical, tolerance: 0}\n"
+        "  X01: {name: Bad, type: no_such_rule, priority: Urgent, threshold: high}\n"
+    )
+    problems = validate_rules_config(str(path))
+    assert len(problems) == 3 and all(p.startswith("Rule X01") for p in problems)
+
+    path.write_text("execution:\n  rule_timeout_s: -1\nrules: {}\n")
+    assert len(validate_rules_config(str(path))) == 1
+
+    with pytest.raises(ValueError):
+        load_execution_policy(str(path), overrides={"fail_fats": True})
+
+
+def test_validate_table_config(tmp_path):
+    sf = tmp_path / "sf.csv"
+    sf.write_text("ID\n1\n")
+    tables = {
+        "Ok": {"sf": str(sf), "laweb": str(sf), "primary_key": "ID", "rules_enabled": ["V01"]},
+        "Broken": {"sf": str(tmp_path / "missing.csv"), "laweb": str(sf), "rules_enabled": ["V01", "Z99"]},
+    }
+    problems = validate_table_config(tables, ["V01"])
+    assert problems == [
+        "Table Broken: missing 'primary_key'.",
+        f"Table Broken: sf file not found: {tmp_path / 'missing.csv'}",
+        "Table Broken: unknown rule(s) in rules_enabled: Z99",
+    ]